@@ -1 +1,8 @@
-from .main import app
+def __getattr__(name):
+    # Importing the FastAPI app pulls in the whole server; only do it when
+    # ``app.app`` is asked for, so modules like app.cache or app.startup
+    # can be imported on their own
+    if name == "app":
+        from .main import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
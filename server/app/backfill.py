@@ -0,0 +1,257 @@
+"""Extract resumes from a directory or zip archive of PDFs on every core.
+
+Documents are handed to a pool of forked worker processes in chunks; each
+worker reads its files, extracts their text and runs NER over the whole
+chunk at once. The spaCy model and skill taxonomy are loaded once before
+the pool starts and shared with the workers copy-on-write.
+
+Results go to an NDJSON file or are bulk inserted into the resumes
+collection (MONGODB_URI, MONGODB_DB), where the content hash index skips
+files that are already stored. Every finished document is recorded in a
+checkpoint file, so an interrupted run picks up where it stopped. A
+document can be written twice if the run stops between writing a chunk
+and recording it; Mongo inserts deduplicate these, NDJSON output may not.
+
+Usage (from the server directory):
+    python -m app.backfill SOURCE (--output OUT.ndjson | --mongo)
+        [--workers N] [--chunk-size 16] [--checkpoint PATH] [--retry-errors]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+import zipfile
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from dotenv import load_dotenv
+from pymongo.errors import BulkWriteError
+
+from .database import MongoManager
+from .extraction import ExtractionError, extract_resumes
+from .nlp_backend import NlpBackend
+from .pdf_engine import pdf_engine
+from .schema import encode_resume, ensure_resume_indexes
+from .taxonomy import SkillTaxonomy, TaxonomyStore
+
+DUPLICATE_KEY = 11000
+
+# Loaded before the pool forks and inherited by every worker
+_worker_state: Dict[str, Any] = {}
+
+
+@dataclass(frozen=True)
+class Document:
+    """A PDF on disk, or a member of a zip archive"""
+    name: str
+    path: str
+    member: Optional[str] = None
+
+    def read(self, archives: Dict[str, zipfile.ZipFile]) -> bytes:
+        """Read the file; zip archives are opened once and kept in ``archives``"""
+        if self.member is None:
+            with open(self.path, "rb") as f:
+                return f.read()
+        archive = archives.get(self.path)
+        if archive is None:
+            archive = archives[self.path] = zipfile.ZipFile(self.path)
+        return archive.read(self.member)
+
+
+def find_documents(source: str) -> List[Document]:
+    """PDFs under a directory or inside a zip archive, in a stable order"""
+    if os.path.isdir(source):
+        documents = []
+        for root, _, files in os.walk(source):
+            for filename in files:
+                if filename.lower().endswith(".pdf"):
+                    path = os.path.join(root, filename)
+                    documents.append(Document(os.path.relpath(path, source), path))
+        return sorted(documents, key=lambda document: document.name)
+    with zipfile.ZipFile(source) as archive:
+        return [
+            Document(member.filename, source, member.filename)
+            for member in sorted(archive.infolist(), key=lambda member: member.filename)
+            if not member.is_dir() and member.filename.lower().endswith(".pdf")
+        ]
+
+
+def process_chunk(documents: List[Document]) -> List[Dict[str, Any]]:
+    """Extract a chunk of documents (runs in a worker process)"""
+    results: List[Dict[str, Any]] = []
+    contents, readable = [], []
+    archives: Dict[str, zipfile.ZipFile] = {}
+    try:
+        for document in documents:
+            try:
+                contents.append(document.read(archives))
+                readable.append(document)
+            except (OSError, KeyError, zipfile.BadZipFile) as e:
+                results.append({"source": document.name, "error": f"Failed to read file: {str(e)}"})
+    finally:
+        for archive in archives.values():
+            archive.close()
+    extracted = extract_resumes(
+        contents, _worker_state["nlp"], _worker_state["taxonomy"],
+        _worker_state["max_pages"], _worker_state["batch_size"]
+    )
+    for document, content, data in zip(readable, contents, extracted):
+        if isinstance(data, ExtractionError):
+            results.append({"source": document.name, "error": str(data)})
+        else:
+            data["content_hash"] = hashlib.sha256(content).hexdigest()
+            results.append({"source": document.name, "data": data})
+    return results
+
+
+class Checkpoint:
+    """Append-only record of finished documents, one JSON object per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: Dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # a line cut short by an interruption
+                    self.done[entry["source"]] = entry["status"]
+
+    def skip(self, retry_errors: bool) -> Set[str]:
+        return {source for source, status in self.done.items() if not (retry_errors and status == "error")}
+
+    def record(self, results: Iterable[Dict[str, Any]]):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for result in results:
+                entry = {"source": result["source"], "status": result["status"]}
+                if "error" in result:
+                    entry["error"] = result["error"]
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class NdjsonSink:
+    def __init__(self, path: str):
+        self._file = open(path, "a", encoding="utf-8")
+
+    async def write(self, results: List[Dict[str, Any]]):
+        for result in results:
+            if "data" in result:
+                self._file.write(json.dumps({"source": result["source"], **result["data"]}, default=str) + "\n")
+                result["status"] = "ok"
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class MongoSink:
+    def __init__(self, collection, taxonomy: SkillTaxonomy):
+        self.collection = collection
+        self.taxonomy = taxonomy
+
+    async def write(self, results: List[Dict[str, Any]]):
+        pending = [result for result in results if "data" in result]
+        if not pending:
+            return
+        documents = [encode_resume(result["data"], self.taxonomy) for result in pending]
+        failed: Dict[int, Dict[str, Any]] = {}
+        try:
+            await self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            failed = {error["index"]: error for error in e.details.get("writeErrors", [])}
+        for index, result in enumerate(pending):
+            error = failed.get(index)
+            if error is None:
+                result["status"] = "ok"
+            elif error.get("code") == DUPLICATE_KEY:
+                result["status"] = "duplicate"
+            else:
+                result["error"] = f"Failed to save resume: {error.get('errmsg')}"
+
+    def close(self):
+        pass
+
+
+async def run_backfill(args):
+    load_dotenv()
+    documents = find_documents(args.source)
+    checkpoint = Checkpoint(args.checkpoint or f"{args.output or 'backfill'}.checkpoint")
+    skip = checkpoint.skip(args.retry_errors)
+    pending = [document for document in documents if document.name not in skip]
+    print(f"{len(documents)} PDFs found, {len(documents) - len(pending)} already done, "
+          f"{len(pending)} to process", file=sys.stderr)
+    if not pending:
+        return
+
+    mongo = MongoManager()
+    if args.mongo:
+        await mongo.connect()
+    try:
+        taxonomy_store = TaxonomyStore(collection=mongo.db.skills if args.mongo else None)
+        taxonomy = await taxonomy_store.reload()
+        if args.mongo:
+            await ensure_resume_indexes(mongo.db.resumes)
+            sink = MongoSink(mongo.db.resumes, taxonomy)
+        else:
+            sink = NdjsonSink(args.output)
+
+        # Load everything the workers share, then fork them
+        backend = NlpBackend()
+        _worker_state.update(
+            nlp=await asyncio.to_thread(backend.get), taxonomy=taxonomy,
+            max_pages=pdf_engine.page_cap, batch_size=args.chunk_size,
+        )
+        chunks = [pending[start:start + args.chunk_size] for start in range(0, len(pending), args.chunk_size)]
+        counts = {"ok": 0, "duplicate": 0, "error": 0}
+        start_time = time.perf_counter()
+        context = multiprocessing.get_context("fork")
+        try:
+            with context.Pool(args.workers) as pool:
+                results = pool.imap_unordered(process_chunk, chunks)
+                while True:
+                    chunk_results = await asyncio.to_thread(next, results, None)
+                    if chunk_results is None:
+                        break
+                    await sink.write(chunk_results)
+                    for result in chunk_results:
+                        result.setdefault("status", "error")
+                        counts[result["status"]] += 1
+                    checkpoint.record(chunk_results)
+                    done = sum(counts.values())
+                    elapsed = time.perf_counter() - start_time
+                    print(f"\r{done}/{len(pending)} documents, {done / elapsed:.1f} docs/s, "
+                          f"{counts['error']} errors", end="", file=sys.stderr)
+        finally:
+            sink.close()
+        elapsed = time.perf_counter() - start_time
+        done = sum(counts.values())
+        print(f"\nProcessed {done} documents in {elapsed:.1f}s ({done / elapsed:.1f} docs/s): "
+              f"{counts['ok']} saved, {counts['duplicate']} duplicates, {counts['error']} errors",
+              file=sys.stderr)
+    finally:
+        mongo.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract resumes from a directory or zip archive of PDFs")
+    parser.add_argument("source", help="directory or zip archive of PDFs")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--output", help="NDJSON file to append results to")
+    target.add_argument("--mongo", action="store_true", help="insert results into the resumes collection")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=16, help="documents per unit of work")
+    parser.add_argument("--checkpoint", help="progress file (default OUTPUT.checkpoint or backfill.checkpoint)")
+    parser.add_argument("--retry-errors", action="store_true", help="process documents that failed before again")
+    asyncio.run(run_backfill(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
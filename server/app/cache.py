@@ -0,0 +1,81 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple, Optional
+
+
+class _Entry(NamedTuple):
+    value: Any
+    expires_at: Optional[float]
+    size: int
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry.
+
+    Optionally entries expire ``ttl`` seconds after they are set, and the
+    total ``sizeof`` of the values is kept under ``max_bytes``. Expired
+    entries are dropped when looked up or when they reach the LRU end.
+    ``on_evict`` is called with the reason ("lru", "ttl" or "memory") for
+    every entry removed to make room or because it expired.
+    """
+
+    def __init__(self, max_entries: int, ttl: Optional[float] = None,
+                 max_bytes: Optional[int] = None,
+                 sizeof: Optional[Callable[[Any], int]] = None,
+                 on_evict: Optional[Callable[[str], None]] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self.on_evict = on_evict
+        self.size = 0
+        self._data: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            self._remove(key, "ttl")
+            return None
+        self._data.move_to_end(key)
+        return entry.value
+
+    def set(self, key: Hashable, value: Any):
+        if key in self._data:
+            self._remove(key)
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        self._data[key] = _Entry(value, expires_at, size)
+        self.size += size
+        while len(self._data) > self.max_entries:
+            self._evict_oldest("lru")
+        while self.max_bytes is not None and self.size > self.max_bytes:
+            self._evict_oldest("memory")
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        entry = self._remove(key)
+        return entry.value if entry is not None else None
+
+    def _evict_oldest(self, reason: str):
+        key, entry = next(iter(self._data.items()))
+        # An expired entry is counted as such even when space forced it out
+        if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            reason = "ttl"
+        self._remove(key, reason)
+
+    def _remove(self, key: Hashable, reason: Optional[str] = None) -> Optional[_Entry]:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+            if reason is not None and self.on_evict is not None:
+                self.on_evict(reason)
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
@@ -0,0 +1,119 @@
+import logging
+import os
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
+from pymongo.write_concern import WriteConcern
+
+from .metrics import (
+    mongo_pool_checked_out,
+    mongo_pool_checkout_failures,
+    mongo_pool_max_size,
+    mongo_pool_open,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Export connection pool utilization to Prometheus"""
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        mongo_pool_open.inc()
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        mongo_pool_open.dec()
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        mongo_pool_checkout_failures.labels(reason=str(event.reason)).inc()
+
+    def connection_checked_out(self, event):
+        mongo_pool_checked_out.inc()
+
+    def connection_checked_in(self, event):
+        mongo_pool_checked_out.dec()
+
+
+class MongoManager:
+    """Owns the single Motor client of a worker process.
+
+    The client is created by ``connect`` during application startup and
+    closed on shutdown; everything else borrows ``db`` from here instead of
+    opening clients of its own.
+
+    Configuration (environment variables):
+        MONGODB_URI                       - connection string
+        MONGODB_DB                        - database name (default resume_extractor)
+        MONGO_MAX_POOL_SIZE               - connections per worker (default 100)
+        MONGO_MIN_POOL_SIZE               - connections kept open (default 0)
+        MONGO_MAX_IDLE_TIME_MS            - close idle connections after (default 60000)
+        MONGO_WAIT_QUEUE_TIMEOUT_MS       - max wait for a free connection (default 5000)
+        MONGO_CONNECT_TIMEOUT_MS          - default 5000
+        MONGO_SERVER_SELECTION_TIMEOUT_MS - default 5000
+        MONGO_WRITE_CONCERN               - w value, e.g. 1 or majority (default 1)
+    """
+
+    def __init__(self):
+        self.client: Optional[AsyncIOMotorClient] = None
+        self._db: Optional[AsyncIOMotorDatabase] = None
+
+    @property
+    def db(self) -> AsyncIOMotorDatabase:
+        if self._db is None:
+            raise RuntimeError("MongoDB client is not connected")
+        return self._db
+
+    async def connect(self):
+        if self.client is not None:
+            return
+        max_pool_size = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+        write_concern = os.getenv("MONGO_WRITE_CONCERN", "1")
+        self.client = AsyncIOMotorClient(
+            os.getenv("MONGODB_URI", "mongodb://localhost:27017"),
+            maxPoolSize=max_pool_size,
+            minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", "0")),
+            maxIdleTimeMS=int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000")),
+            waitQueueTimeoutMS=int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000")),
+            connectTimeoutMS=int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000")),
+            serverSelectionTimeoutMS=int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+            event_listeners=[PoolMetricsListener()],
+        )
+        w = int(write_concern) if write_concern.isdigit() else write_concern
+        self._db = self.client.get_database(
+            os.getenv("MONGODB_DB", "resume_extractor"),
+            write_concern=WriteConcern(w=w),
+        )
+        mongo_pool_max_size.set(max_pool_size)
+        await self.client.server_info()
+        logger.info(f"MongoDB connection successful (max pool size {max_pool_size})")
+
+    def attach(self, client, db_name: Optional[str] = None):
+        """Use an already created client, e.g. a local stand-in for benchmarks"""
+        self.client = client
+        self._db = client.get_database(db_name or os.getenv("MONGODB_DB", "resume_extractor"))
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+            self._db = None
+            logger.info("MongoDB connection closed")
@@ -0,0 +1,326 @@
+"""Bulk export of the resumes collection as CSV, NDJSON or Parquet.
+
+Resumes are read through a batched cursor in _id order, flattened into
+rows and encoded one chunk at a time, so memory is bounded by the chunk
+size and not by the collection. Three tables can be exported:
+
+    resumes    - one row per resume; skills, companies and roles joined by "; "
+    skills     - one row per resume and skill
+    experience - one row per experience entry
+
+Parquet output uses pyarrow, which is imported only when a Parquet
+export is requested.
+
+From the command line (run from the server directory):
+
+    python -m app.export OUT_FILE [--format csv|ndjson|parquet] [--table resumes]
+        [--since 2024-01-01T00:00:00] [--after OBJECT_ID] [--state-file PATH]
+
+With ``--state-file`` the last exported _id is stored after a successful
+run and used as ``--after`` on the next one, so nightly jobs only move
+the delta.
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from bson import ObjectId
+from dotenv import load_dotenv
+
+from .database import MongoManager
+from .schema import LEGACY_VERSION
+from .taxonomy import SkillTaxonomy, TaxonomyStore
+
+EXPORT_FORMATS = ("csv", "ndjson", "parquet")
+EXPORT_TABLES = ("resumes", "skills", "experience")
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+COLUMNS = {
+    "resumes": ["id", "name", "email", "phone", "uploaded_at", "skills", "skill_count",
+                "companies", "roles", "experience_count", "summary"],
+    "skills": ["id", "skill", "category"],
+    "experience": ["id", "name", "email", "company", "role", "duration"],
+}
+
+PROJECTIONS = {
+    "resumes": {"name": 1, "email": 1, "phone": 1, "uploaded_at": 1, "skills": 1,
+                "experience": 1, "summary": 1, "v": 1},
+    "skills": {"skills": 1},
+    "experience": {"name": 1, "email": 1, "experience": 1},
+}
+
+INTEGER_COLUMNS = {"skill_count", "experience_count"}
+TIMESTAMP_COLUMNS = {"uploaded_at"}
+
+LIST_SEPARATOR = "; "
+
+
+class ExportUnavailable(Exception):
+    """Raised when the requested format needs a package that is not installed"""
+
+
+def export_query(since: Optional[datetime] = None, after: Optional[ObjectId] = None,
+                 until: Optional[ObjectId] = None) -> Dict[str, Any]:
+    """Filter for resumes uploaded at or after ``since`` and with _id in (after, until].
+
+    ``since`` also becomes an _id bound: an ObjectId is created when the
+    resume is inserted, after its uploaded_at was set, so the bound never
+    excludes a match and lets the scan run on the _id index in _id order.
+    """
+    if since is not None and since.tzinfo is not None:
+        # Stored datetimes and ISO strings are naive UTC
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    id_range: Dict[str, Any] = {}
+    if after is not None:
+        id_range["$gt"] = after
+    if since is not None:
+        lower = ObjectId.from_datetime(since)
+        if after is None or lower > after:
+            id_range = {"$gte": lower}
+    if until is not None:
+        id_range["$lte"] = until
+    query: Dict[str, Any] = {}
+    if id_range:
+        query["_id"] = id_range
+    if since is not None:
+        # Documents not migrated to the current schema keep ISO strings
+        query["$or"] = [{"uploaded_at": {"$gte": since}}, {"uploaded_at": {"$gte": since.isoformat()}}]
+    return query
+
+
+def _uploaded_at(value) -> Optional[datetime]:
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return value
+
+
+def flatten(document: Dict[str, Any], table: str, taxonomy: SkillTaxonomy) -> Iterable[Dict[str, Any]]:
+    """Rows of ``table`` for one stored resume of any schema version"""
+    resume_id = str(document["_id"])
+    if table == "skills":
+        for skill in taxonomy.decode_skills(document.get("skills", [])):
+            yield {"id": resume_id, "skill": skill, "category": taxonomy.categories.get(skill, "")}
+        return
+
+    experience = document.get("experience", [])
+    if table == "experience":
+        for entry in experience:
+            yield {
+                "id": resume_id,
+                "name": document.get("name", ""),
+                "email": document.get("email", ""),
+                "company": entry.get("company", ""),
+                "role": entry.get("role", ""),
+                "duration": entry.get("duration", ""),
+            }
+        return
+
+    skills = taxonomy.decode_skills(document.get("skills", []))
+    summary = document.get("summary")
+    if document.get("v", LEGACY_VERSION) < 2:
+        summary = experience[0].get("description", "") if experience else ""
+    yield {
+        "id": resume_id,
+        "name": document.get("name", ""),
+        "email": document.get("email", ""),
+        "phone": document.get("phone", ""),
+        "uploaded_at": _uploaded_at(document.get("uploaded_at")),
+        "skills": LIST_SEPARATOR.join(skills),
+        "skill_count": len(skills),
+        "companies": LIST_SEPARATOR.join(entry.get("company", "") for entry in experience),
+        "roles": LIST_SEPARATOR.join(entry.get("role", "") for entry in experience),
+        "experience_count": len(experience),
+        "summary": summary or "",
+    }
+
+
+def _text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class CsvChunkWriter:
+    def __init__(self, columns: List[str]):
+        self.columns = columns
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._writer.writerow(columns)
+
+    def write(self, rows: List[Dict[str, Any]]) -> bytes:
+        for row in rows:
+            self._writer.writerow([_text(row[column]) for column in self.columns])
+        return self._drain()
+
+    def close(self) -> bytes:
+        return self._drain()
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+
+class NdjsonChunkWriter:
+    def __init__(self, columns: List[str]):
+        self.columns = columns
+
+    def write(self, rows: List[Dict[str, Any]]) -> bytes:
+        return "".join(
+            json.dumps({column: row[column] for column in self.columns}, default=_text) + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+    def close(self) -> bytes:
+        return b""
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ParquetChunkWriter:
+    """Writes each chunk as a row group; only the current one is held in memory"""
+
+    def __init__(self, columns: List[str]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ExportUnavailable("Parquet export requires pyarrow: pip install pyarrow")
+        self._pa = pa
+        self.columns = columns
+        self.schema = pa.schema([
+            (column, pa.int64() if column in INTEGER_COLUMNS
+             else pa.timestamp("us") if column in TIMESTAMP_COLUMNS else pa.string())
+            for column in columns
+        ])
+        self._sink = _DrainableSink()
+        self._writer = pq.ParquetWriter(self._sink, self.schema, compression="zstd")
+
+    def write(self, rows: List[Dict[str, Any]]) -> bytes:
+        table = self._pa.Table.from_pylist(
+            [{column: row[column] for column in self.columns} for row in rows], schema=self.schema
+        )
+        self._writer.write_table(table)
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+WRITERS = {"csv": CsvChunkWriter, "ndjson": NdjsonChunkWriter, "parquet": ParquetChunkWriter}
+
+
+def open_writer(fmt: str, table: str):
+    """Chunk writer for a format; raises ExportUnavailable if it cannot be used"""
+    return WRITERS[fmt](COLUMNS[table])
+
+
+async def export_chunks(cursor, writer, table: str, taxonomy: SkillTaxonomy,
+                        chunk_rows: int = 1000, stats: Optional[Dict[str, Any]] = None) -> AsyncIterator[bytes]:
+    """Encoded output for every resume the cursor returns, a chunk at a time.
+
+    Encoding runs in a thread so large chunks do not hold up the event
+    loop. ``stats`` collects the row count and the last exported _id.
+    """
+    stats = stats if stats is not None else {}
+    stats.setdefault("rows", 0)
+    rows: List[Dict[str, Any]] = []
+    async for document in cursor:
+        rows.extend(flatten(document, table, taxonomy))
+        stats["last_id"] = document["_id"]
+        if len(rows) >= chunk_rows:
+            stats["rows"] += len(rows)
+            yield await asyncio.to_thread(writer.write, rows)
+            rows = []
+    if rows:
+        stats["rows"] += len(rows)
+        yield await asyncio.to_thread(writer.write, rows)
+    yield await asyncio.to_thread(writer.close)
+
+
+async def run_export(args):
+    load_dotenv()
+    after = ObjectId(args.after) if args.after else None
+    if args.state_file and after is None and os.path.exists(args.state_file):
+        with open(args.state_file, "r", encoding="utf-8") as f:
+            after = ObjectId(json.load(f)["last_id"])
+    since = datetime.fromisoformat(args.since) if args.since else None
+    writer = open_writer(args.format, args.table)
+
+    mongo = MongoManager()
+    await mongo.connect()
+    try:
+        taxonomy = await TaxonomyStore(collection=mongo.db.skills).reload()
+        collection = mongo.db.resumes
+        start_time = time.perf_counter()
+        stats: Dict[str, Any] = {}
+        cursor = collection.find(
+            export_query(since, after), PROJECTIONS[args.table]
+        ).sort("_id", 1).batch_size(args.batch_size)
+        with open(args.out_file, "wb") as out:
+            async for chunk in export_chunks(cursor, writer, args.table, taxonomy, args.chunk_rows, stats):
+                out.write(chunk)
+        print(f"Exported {stats['rows']} {args.table} rows to {args.out_file} "
+              f"in {time.perf_counter() - start_time:.1f}s")
+        if args.state_file and "last_id" in stats:
+            with open(args.state_file, "w", encoding="utf-8") as f:
+                json.dump({"last_id": str(stats["last_id"]), "exported_at": datetime.utcnow().isoformat()}, f)
+    finally:
+        mongo.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export resumes as CSV, NDJSON or Parquet")
+    parser.add_argument("out_file")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument("--table", choices=EXPORT_TABLES, default="resumes")
+    parser.add_argument("--since", help="only resumes uploaded at or after this ISO date/time")
+    parser.add_argument("--after", help="only resumes with an _id greater than this one")
+    parser.add_argument("--state-file", help="read --after from and write the last _id to this file")
+    parser.add_argument("--batch-size", type=int, default=1000, help="documents per cursor batch")
+    parser.add_argument("--chunk-rows", type=int, default=5000, help="rows encoded per chunk / row group")
+    asyncio.run(run_export(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
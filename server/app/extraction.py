@@ -0,0 +1,173 @@
+"""Resume extraction without any web framework.
+
+Turns PDF text into resume data. The async functions run on the shared
+PDF engine and an NLP executor and are used by the API; ``extract_resumes``
+does the whole job synchronously in the calling process, for offline tools
+such as the backfill CLI. Failures raise ExtractionError (a ValueError),
+which callers map to their own error reporting.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+from .field_extractor import FieldScanner
+from .metrics import StageTimings
+from .nlp_executor import NlpExecutor, find_organizations
+from .pdf_engine import PdfEngineBusy, PdfSource, iter_page_text, open_pdf, pdf_engine
+from .taxonomy import SkillTaxonomy
+
+SUMMARY_WORDS = 50
+
+
+class ExtractionError(ValueError):
+    """Raised when a document cannot be turned into resume data"""
+
+
+def first_words(pages: List[str], count: int) -> str:
+    """Return the first words of a document without splitting every page"""
+    words = []
+    for page in pages:
+        words.extend(page.split())
+        if len(words) >= count:
+            break
+    return " ".join(words[:count])
+
+
+def build_resume_data(pages: List[str], companies: List[str], taxonomy: SkillTaxonomy,
+                      timings: Optional[StageTimings] = None) -> dict:
+    """Build resume data from page texts and the organizations NER found in them"""
+    timings = timings or StageTimings()
+
+    # Extract skills page by page
+    with timings.stage("skills"):
+        matcher = taxonomy.matcher
+        skills = {}
+        for page in pages:
+            for skill in matcher.match(page):
+                skills.setdefault(skill, None)
+        skills = list(skills)
+
+    # Extract name, email, phone, roles and dates page by page. Contact
+    # details are normally on the first page, and experience entries pair
+    # roles and dates with companies, so the scan stops early once both
+    # are satisfied.
+    with timings.stage("fields"):
+        scanner = FieldScanner(limit=len(companies))
+        for page in pages:
+            scanner.feed(page)
+            if scanner.done:
+                break
+    fields = scanner.fields
+    name = fields.name.value if fields.name else ""
+    email = fields.email.value if fields.email else ""
+    phone = fields.phone.value if fields.phone else ""
+    roles = [role.value for role in fields.roles]
+    durations = [date.value for date in fields.dates]
+
+    # Create experience entries; they share one description, the first
+    # 50 words, which is stored once as the summary
+    experiences = []
+    for i in range(min(len(companies), len(roles), len(durations))):
+        experiences.append({
+            "company": companies[i],
+            "role": roles[i],
+            "duration": durations[i]
+        })
+
+    # Validate required fields
+    if not name or not email:
+        raise ExtractionError("Missing required fields: name and email are required")
+
+    return {
+        "name": name,
+        "email": email,
+        "phone": phone,
+        "skills": skills,
+        "experience": experiences,
+        "summary": first_words(pages, SUMMARY_WORDS),
+        "uploaded_at": datetime.utcnow()
+    }
+
+
+def validate_resume_data(data: dict):
+    """Check that extracted resume data has the fields we store"""
+    # Validate required fields
+    if not all(key in data for key in ['name', 'email', 'phone', 'skills', 'uploaded_at']):
+        raise ExtractionError("Missing required fields in resume data")
+
+    # Validate experience data structure
+    if 'experience' in data:
+        for exp in data['experience']:
+            if not all(key in exp for key in ['company', 'role', 'duration']):
+                raise ExtractionError("Invalid experience data structure")
+
+
+def require_text(pages: List[str]) -> List[str]:
+    if not any(page.strip() for page in pages):
+        raise ExtractionError("Failed to extract text from PDF")
+    return pages
+
+
+async def extract_pages_from_pdf(source: PdfSource, wait: bool = False,
+                                 timings: Optional[StageTimings] = None) -> List[str]:
+    """Extract the text of each page on the PDF engine, up to PDF_PAGE_CAP pages.
+
+    PdfEngineBusy is passed through; any other failure raises ExtractionError.
+    """
+    try:
+        return await pdf_engine.extract_pages(source, wait=wait, timings=timings)
+    except PdfEngineBusy:
+        raise
+    except Exception as e:
+        raise ExtractionError(str(e)) from e
+
+
+async def analyze_resume(pages: Union[str, List[str]], nlp_executor: NlpExecutor, taxonomy: SkillTaxonomy,
+                         timings: Optional[StageTimings] = None) -> dict:
+    """Resume data for a document's text, given whole or as a list of pages.
+
+    NlpBusy and NlpTimeout from the executor are passed through.
+    """
+    if isinstance(pages, str):
+        pages = [pages]
+    text = "".join(pages)
+    if not text.strip():
+        raise ExtractionError("No text content provided")
+    timings = timings or StageTimings()
+    with timings.stage("ner"):
+        companies = await nlp_executor.organizations(text)
+    return build_resume_data(pages, companies, taxonomy, timings)
+
+
+def read_pages(source: PdfSource, max_pages: Optional[int] = None) -> List[str]:
+    """Extract page texts in the calling thread"""
+    try:
+        with open_pdf(source) as pdf_document:
+            return list(iter_page_text(pdf_document, max_pages))
+    except Exception as e:
+        raise ExtractionError(f"Failed to extract text: {str(e)}") from e
+
+
+def extract_resumes(sources: List[PdfSource], nlp, taxonomy: SkillTaxonomy,
+                    max_pages: Optional[int] = None, batch_size: int = 32) -> List[Union[dict, ExtractionError]]:
+    """Resume data for each document, synchronously, with NER over all of them at once.
+
+    Returns the data or the ExtractionError for each source, in order, so
+    one bad file does not fail the rest.
+    """
+    results: List[Union[dict, ExtractionError]] = []
+    texts: Dict[int, List[str]] = {}
+    for index, source in enumerate(sources):
+        try:
+            texts[index] = require_text(read_pages(source, max_pages))
+            results.append(None)
+        except ExtractionError as e:
+            results.append(e)
+    organizations = find_organizations(nlp, ["".join(pages) for pages in texts.values()], batch_size)
+    for (index, pages), companies in zip(texts.items(), organizations):
+        try:
+            data = build_resume_data(pages, companies, taxonomy)
+            validate_resume_data(data)
+            results[index] = data
+        except ExtractionError as e:
+            results[index] = e
+    return results
@@ -0,0 +1,168 @@
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, List, NamedTuple, Optional
+
+ROLE_WORDS = [
+    "software", "senior", "junior", "lead", "principal", "chief technology officer",
+    "chief", "cto", "director", "manager", "engineer", "developer", "analyst",
+    "architect", "consultant",
+]
+
+MONTHS = [
+    "january", "february", "march", "april", "may", "june", "july", "august",
+    "september", "october", "november", "december",
+]
+
+PHONE_MIN_DIGITS = 10
+PHONE_MAX_DIGITS = 15
+
+
+def _word_alternation(words: Iterable[str]) -> str:
+    """Build a prefix-factored alternation so each position fails on its first character"""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + emit(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        body = "|".join(branches)
+        if "" in node:
+            return f"(?:{body})?"
+        return body if len(branches) == 1 else f"(?:{body})"
+
+    return emit(trie)
+
+
+ROLE_PATTERN = _word_alternation(ROLE_WORDS)
+DATE_PATTERN = r"\d{4}|" + _word_alternation(MONTHS)
+
+# Contact fields. Each pattern is searched on its own and stops at the
+# first hit, which for almost every resume is on the first page. All
+# repetitions are bounded and the lookbehinds reject starts in the middle
+# of a token, so long tokens (URLs, hashes) cannot cause heavy backtracking.
+EMAIL_RE = re.compile(r"(?<![\w.%+-])[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,253}\.[A-Za-z]{2,24}")
+PHONE_RE = re.compile(r"(?<![\w+])\+?\(?\d[\d \t().-]{8,20}\d(?!\d)")
+NAME_RE = re.compile(r"\b[A-Z][a-z]{1,30}[ \t]{1,3}[A-Z][a-z]{1,30}\b")
+
+# Roles and dates in one case-sensitive pass over the lowercased text.
+# sre compares IGNORECASE patterns character by character, so lowering the
+# text once and matching case-sensitively is markedly cheaper.
+EXPERIENCE_RE = re.compile(
+    rf"(?<!\w)(?:(?P<role>{ROLE_PATTERN})|(?P<date>{DATE_PATTERN}))\b"
+)
+EXPERIENCE_IGNORECASE_RE = re.compile(EXPERIENCE_RE.pattern, re.IGNORECASE)
+
+
+class FieldMatch(NamedTuple):
+    value: str
+    start: int
+    end: int
+
+
+@dataclass
+class ResumeFields:
+    name: Optional[FieldMatch] = None
+    email: Optional[FieldMatch] = None
+    phone: Optional[FieldMatch] = None
+    roles: List[FieldMatch] = field(default_factory=list)
+    dates: List[FieldMatch] = field(default_factory=list)
+
+
+def _first(pattern: re.Pattern, text: str, offset: int) -> Optional[FieldMatch]:
+    match = pattern.search(text)
+    if match is None:
+        return None
+    return FieldMatch(match.group(), match.start() + offset, match.end() + offset)
+
+
+def _first_phone(text: str, offset: int) -> Optional[FieldMatch]:
+    for match in PHONE_RE.finditer(text):
+        digits = sum(char.isdigit() for char in match.group())
+        if PHONE_MIN_DIGITS <= digits <= PHONE_MAX_DIGITS:
+            return FieldMatch(match.group(), match.start() + offset, match.end() + offset)
+    return None
+
+
+class FieldScanner:
+    """Extract fields from a document fed one page at a time.
+
+    Offsets are relative to the concatenation of all pages fed so far.
+    Contact fields stop being searched as soon as each is found, and the
+    role/date scan stops once ``limit`` of each are collected, so later
+    pages of a long document cost nothing once the scanner is done.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        self.fields = ResumeFields()
+        self.limit = limit
+        self._offset = 0
+
+    @property
+    def contact_complete(self) -> bool:
+        fields = self.fields
+        return fields.name is not None and fields.email is not None and fields.phone is not None
+
+    @property
+    def experience_complete(self) -> bool:
+        limit = self.limit
+        return limit is not None and len(self.fields.roles) >= limit and len(self.fields.dates) >= limit
+
+    @property
+    def done(self) -> bool:
+        return self.contact_complete and self.experience_complete
+
+    def feed(self, page: str):
+        """Scan the next page"""
+        offset = self._offset
+        self._offset += len(page)
+        fields = self.fields
+        if fields.name is None:
+            fields.name = _first(NAME_RE, page, offset)
+        if fields.email is None:
+            fields.email = _first(EMAIL_RE, page, offset)
+        if fields.phone is None:
+            fields.phone = _first_phone(page, offset)
+        if not self.experience_complete:
+            self._scan_experience(page, offset)
+
+    def _scan_experience(self, page: str, offset: int):
+        lowered = page.lower()
+        if len(lowered) == len(page):
+            matches = EXPERIENCE_RE.finditer(lowered)
+        else:
+            # A few characters change length when lowercased; offsets would drift
+            matches = EXPERIENCE_IGNORECASE_RE.finditer(page)
+        phone = self.fields.phone
+        roles, dates = self.fields.roles, self.fields.dates
+        limit = self.limit
+        for match in matches:
+            start, end = match.span()
+            # Short words ("cto", "may") are too ambiguous to keep
+            if end - start <= 3:
+                continue
+            found = FieldMatch(page[start:end], start + offset, end + offset)
+            if match.lastgroup == "role":
+                roles.append(found)
+            # Four-digit groups of the phone number are not years
+            elif phone is None or found.end <= phone.start or found.start >= phone.end:
+                dates.append(found)
+            if limit is not None and len(roles) >= limit and len(dates) >= limit:
+                break
+
+
+def extract_fields(text: str, limit: Optional[int] = None) -> ResumeFields:
+    """Find name, email, phone, roles and dates with their offsets.
+
+    With ``limit``, the scan stops once that many roles and dates are found.
+    """
+    scanner = FieldScanner(limit)
+    scanner.feed(text)
+    return scanner.fields
@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobQueueFull(Exception):
+    """Raised when no more jobs can be accepted"""
+
+
+class MemoryJobStore:
+    """In-process job state, for single-worker deployments and local runs.
+
+    Only the worker that accepted a job can report on it, so use
+    MongoJobStore when running several gunicorn workers.
+    """
+
+    def __init__(self, max_jobs: int = 10000):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    async def create(self, job: Dict[str, Any]):
+        self._jobs[job["_id"]] = job
+        # Forget the oldest finished jobs once the store is full
+        while len(self._jobs) > self.max_jobs:
+            oldest = next((key for key, value in self._jobs.items()
+                           if value["status"] in (SUCCEEDED, FAILED)), None)
+            if oldest is None:
+                break
+            del self._jobs[oldest]
+
+    async def update(self, job_id: str, fields: Dict[str, Any]):
+        if job_id in self._jobs:
+            self._jobs[job_id].update(fields)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(job_id)
+        return dict(job) if job else None
+
+
+class MongoJobStore:
+    """Job state in a Mongo collection, visible to every worker.
+
+    The collection may be assigned after construction, once the database
+    client is connected.
+    """
+
+    def __init__(self, collection=None, ttl_seconds: int = 86400):
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("created_at", expireAfterSeconds=self.ttl_seconds)
+
+    async def create(self, job: Dict[str, Any]):
+        await self.collection.insert_one(job)
+
+    async def update(self, job_id: str, fields: Dict[str, Any]):
+        await self.collection.update_one({"_id": job_id}, {"$set": fields})
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one({"_id": job_id})
+
+
+ProgressCallback = Callable[[str, int], Awaitable[None]]
+JobHandler = Callable[[Dict[str, Any], ProgressCallback], Awaitable[Dict[str, Any]]]
+JobDiscard = Callable[[Dict[str, Any]], None]
+
+
+class JobQueue:
+    """Background workers that run queued resume jobs.
+
+    Configuration (environment variables):
+        JOB_WORKERS     - concurrent jobs per process (default 4)
+        JOB_QUEUE_DEPTH - jobs waiting for a worker before submissions are
+                          rejected (default 100)
+
+    Job payloads (the uploaded bytes) stay in process memory; only the job
+    state goes to the store. Jobs still queued or running at shutdown are
+    marked failed, and ``discard`` is called with each queued payload the
+    handler never saw, to release what it holds.
+    """
+
+    def __init__(self, store, handler: JobHandler, discard: Optional[JobDiscard] = None,
+                 workers: Optional[int] = None, queue_depth: Optional[int] = None):
+        self.store = store
+        self.handler = handler
+        self.discard = discard
+        self.workers = workers or int(os.getenv("JOB_WORKERS", "4"))
+        self.queue_depth = queue_depth or int(os.getenv("JOB_QUEUE_DEPTH", "100"))
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+        # Slots taken by submits still creating their job record
+        self._reserved = 0
+
+    def start(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_depth)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info(f"Job queue started with {self.workers} workers")
+
+    async def shutdown(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        dropped = 0
+        while self._queue is not None and not self._queue.empty():
+            job_id, payload = self._queue.get_nowait()
+            if self.discard is not None:
+                try:
+                    self.discard(payload)
+                except Exception as e:
+                    logger.error(f"Error discarding job {job_id}: {str(e)}")
+            await self._set(job_id, status=FAILED, error="Server shut down before the job ran")
+            dropped += 1
+        logger.info(f"Job queue stopped, {dropped} queued jobs dropped")
+
+    async def submit(self, payload: Dict[str, Any], **info) -> str:
+        """Queue a job and return its id"""
+        if self._queue is None:
+            self.start()
+        # Reserve the slot before awaiting, so concurrent submits cannot
+        # all pass the check and overfill the queue
+        if self._queue.qsize() + self._reserved >= self.queue_depth:
+            raise JobQueueFull("Job queue is full")
+        self._reserved += 1
+        try:
+            now = datetime.utcnow()
+            job_id = uuid.uuid4().hex
+            await self.store.create({
+                "_id": job_id,
+                "status": QUEUED,
+                "stage": QUEUED,
+                "progress": 0,
+                "result": None,
+                "error": None,
+                "created_at": now,
+                "updated_at": now,
+                **info
+            })
+        finally:
+            self._reserved -= 1
+        self._queue.put_nowait((job_id, payload))
+        return job_id
+
+    async def _set(self, job_id: str, **fields):
+        fields["updated_at"] = datetime.utcnow()
+        try:
+            await self.store.update(job_id, fields)
+        except Exception as e:
+            logger.error(f"Error updating job {job_id}: {str(e)}")
+
+    async def _worker(self):
+        while True:
+            job_id, payload = await self._queue.get()
+
+            async def progress(stage: str, percent: int):
+                await self._set(job_id, stage=stage, progress=percent)
+
+            try:
+                await self._set(job_id, status=RUNNING)
+                result = await self.handler(payload, progress)
+                await self._set(job_id, status=SUCCEEDED, stage="done", progress=100, result=result)
+            except asyncio.CancelledError:
+                await self._set(job_id, status=FAILED, error="Server shut down while the job was running")
+                raise
+            except Exception as e:
+                logger.error(f"Job {job_id} failed: {getattr(e, 'detail', str(e))}")
+                await self._set(job_id, status=FAILED, error=getattr(e, "detail", str(e)))
+            finally:
+                self._queue.task_done()
+
+
+def job_to_response(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a stored job for the /jobs API"""
+    return {
+        "id": job["_id"],
+        "status": job["status"],
+        "stage": job.get("stage"),
+        "progress": job.get("progress", 0),
+        "filename": job.get("filename"),
+        "result": job.get("result"),
+        "error": job.get("error"),
+        "created_at": job["created_at"].isoformat(),
+        "updated_at": job["updated_at"].isoformat(),
+    }
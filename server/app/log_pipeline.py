@@ -0,0 +1,237 @@
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler
+from typing import Dict, List, Optional
+
+CONSOLE = "-"
+
+_CONSOLE_FORMATTER = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+
+class JsonLineFormatter(logging.Formatter):
+    """One compact JSON object per record.
+
+    Structured data passed as ``extra={"fields": {...}}`` is merged into
+    the top level of the object.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+
+class SampleFilter(logging.Filter):
+    """Keep a fraction of records below WARNING; warnings and errors always pass"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or self.rate >= 1 or random.random() < self.rate
+
+
+class _PipelineHandler(QueueHandler):
+    """Hands records to the writer thread without touching the disk.
+
+    Only the message is rendered on the calling thread; JSON encoding and
+    file I/O happen on the writer. When the queue is full the record is
+    dropped and counted rather than blocking the event loop.
+    """
+
+    def __init__(self, pipeline: "LogPipeline", destination: str):
+        super().__init__(pipeline.queue)
+        self.pipeline = pipeline
+        self.destination = destination
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The same record may be handed to several destinations
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.destination = self.destination
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.pipeline.dropped += 1
+
+
+class RotatingLineWriter:
+    """Appends batches of lines to a file, rotating it by size"""
+
+    def __init__(self, path: str, max_bytes: int, backup_count: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, lines: List[str]):
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        self._file.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def close(self):
+        self._file.close()
+
+
+class LogPipeline:
+    """Queue-based logging with a single background writer thread.
+
+    Request handlers only enqueue records; the writer drains the queue in
+    batches, formats each record as a JSON line and flushes every file
+    touched by the batch once.
+
+    Configuration (environment variables):
+        LOG_DIR                - directory for log files (default ".")
+        LOG_FILE_PER_PROCESS   - "true" (default) to add the process id to
+                                 each file name (app.log -> app.<pid>.log);
+                                 gunicorn workers must not share a rotating
+                                 file, since each would rotate it on its own
+        LOG_MAX_BYTES          - rotate a file once it reaches this size
+                                 (default 10 MB, 0 = never)
+        LOG_BACKUP_COUNT       - rotated files kept per log (default 5)
+        LOG_BATCH_SIZE         - records written per flush (default 256)
+        LOG_FLUSH_INTERVAL     - max seconds a record waits (default 1.0)
+        LOG_QUEUE_SIZE         - records buffered before new ones are
+                                 dropped (default 10000)
+        ACCESS_LOG_SAMPLE_RATE - fraction of successful requests written
+                                 to the access log (default 1.0)
+    """
+
+    def __init__(self):
+        self.directory = os.getenv("LOG_DIR", ".")
+        self.per_process = os.getenv("LOG_FILE_PER_PROCESS", "true").lower() == "true"
+        self.max_bytes = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+        self.backup_count = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+        self.batch_size = int(os.getenv("LOG_BATCH_SIZE", "256"))
+        self.flush_interval = float(os.getenv("LOG_FLUSH_INTERVAL", "1.0"))
+        self.access_sample_rate = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1.0"))
+        self.queue: "queue.Queue[Optional[logging.LogRecord]]" = queue.Queue(
+            int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+        )
+        self.dropped = 0
+        self.formatter = JsonLineFormatter()
+        self._writers: Dict[str, RotatingLineWriter] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def attach(self, logger: logging.Logger, filename: str, console: bool = False,
+               sample_rate: Optional[float] = None):
+        """Send a logger's records to ``filename`` (and stderr with ``console``)"""
+        destinations = [filename] + ([CONSOLE] if console else [])
+        for destination in destinations:
+            handler = _PipelineHandler(self, destination)
+            if sample_rate is not None:
+                handler.addFilter(SampleFilter(sample_rate))
+            logger.addHandler(handler)
+        logger.propagate = False
+        return logger
+
+    def start(self):
+        """Start the writer thread. Records logged earlier wait in the queue."""
+        if self._thread is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Write everything still queued and stop the writer"""
+        if self._thread is None:
+            return
+        self.queue.put(None)
+        self._thread.join()
+        self._thread = None
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+    def _run(self):
+        while True:
+            record = self.queue.get()
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            # Gather whatever else arrives within the flush interval
+            while record is not None:
+                batch.append(record)
+                if len(batch) >= self.batch_size:
+                    break
+                timeout = deadline - time.monotonic()
+                try:
+                    record = self.queue.get(timeout=timeout) if timeout > 0 else self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            if record is None:
+                return
+
+    def _write(self, batch: List[logging.LogRecord]):
+        grouped: Dict[str, List[str]] = {}
+        for record in batch:
+            try:
+                formatter = _CONSOLE_FORMATTER if record.destination == CONSOLE else self.formatter
+                line = formatter.format(record)
+            except Exception:
+                continue
+            grouped.setdefault(record.destination, []).append(line)
+        for destination, lines in grouped.items():
+            try:
+                if destination == CONSOLE:
+                    sys.stderr.write("\n".join(lines) + "\n")
+                    sys.stderr.flush()
+                else:
+                    self._writer(destination).write(lines)
+            except OSError as e:
+                sys.stderr.write(f"Log writer failed for {destination}: {e}\n")
+
+    def path(self, filename: str) -> str:
+        """Path written for ``filename`` by the current process"""
+        if self.per_process:
+            stem, extension = os.path.splitext(filename)
+            filename = f"{stem}.{os.getpid()}{extension}"
+        return os.path.join(self.directory, filename)
+
+    def _writer(self, filename: str) -> RotatingLineWriter:
+        writer = self._writers.get(filename)
+        if writer is None:
+            # Opened on the writer thread, i.e. after any fork into workers
+            writer = RotatingLineWriter(self.path(filename), self.max_bytes, self.backup_count)
+            self._writers[filename] = writer
+        return writer
@@ -1,68 +1,83 @@
-from fastapi import FastAPI, UploadFile, HTTPException, File, Depends, Request
+from fastapi import FastAPI, UploadFile, HTTPException, File, Depends, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
-from fastapi.security import HTTPBearer
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, ValidationError
-from typing import List, Optional, Dict, Any
-import fitz  # PyMuPDF
-import re
-import spacy
-import nltk
+from typing import List, Optional, Dict, Any, Union
+import asyncio
+import hashlib
+import zipfile
 import os
 import logging
 
 from datetime import datetime
 import time
 import json
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
 from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 import os
 from dotenv import load_dotenv
 import logging
-from ratelimit import limits, RateLimitException
-from functools import wraps
 import traceback
 import uuid
 import filetype
-from prometheus_client import Counter, Histogram
 from prometheus_client import make_asgi_app
-from prometheus_fastapi_instrumentator import Instrumentator
 
-# Configure logging
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-
-# Create a file handler
-handler = logging.FileHandler('app.log')
-handler.setLevel(logging.INFO)
-
-# Create a formatter and set the format
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-
-# Add the handler to the logger
-logger.addHandler(handler)
-
-# Add console handler for easier debugging
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
+from .cache import LRUCache
+from .database import MongoManager
+from .extraction import (ExtractionError, analyze_resume, build_resume_data, extract_pages_from_pdf,
+                         require_text, validate_resume_data)
+from .export import (EXPORT_FORMATS, EXPORT_TABLES, MEDIA_TYPES, PROJECTIONS, ExportUnavailable,
+                     export_chunks, export_query, open_writer)
+from .jobs import JobQueue, JobQueueFull, MemoryJobStore, MongoJobStore, job_to_response
+from .log_pipeline import LogPipeline
+from .metrics import StageTimings, dedup_hits, dedup_misses, stage_seconds
+from .middleware import (AccessLogMiddleware, BodySizeLimitMiddleware, MetricsMiddleware,
+                         RateLimitMiddleware, SecurityHeadersMiddleware)
+from .nlp_backend import NlpBackend
+from .nlp_executor import NlpBusy, NlpExecutor, NlpTimeout
+from .pdf_engine import PdfEngineBusy, PdfSource, pdf_engine
+from .rate_limit import MongoWindowLimiter, TokenBucketLimiter
+from .result_cache import ResultCache, text_fingerprint
+from .schema import decode_resume, encode_resume, ensure_resume_indexes, stored_projection
+from .similarity import SimilarityIndex
+from .skill_index import ResumeIndex, SkillIndex
+from .startup import StartupReport, preload as preload_shared_state
+from .taxonomy import TaxonomyStore
+from .uploads import UnsupportedUploadType, UploadTooLarge, read_upload
 
 # Load environment variables
 load_dotenv()
 
+# Configure logging. Records from every app module go through a queue to
+# a background writer thread, so request handlers never wait on disk I/O.
+log_pipeline = LogPipeline()
+package_logger = logging.getLogger(__package__)
+package_logger.setLevel(logging.INFO)
+log_pipeline.attach(package_logger, "app.log", console=True)
+logger = logging.getLogger(__name__)
+
+# Structured one-line JSON logs for requests and unexpected errors
+access_logger = log_pipeline.attach(
+    logging.getLogger(f"{__package__}.access"), "access.log",
+    sample_rate=log_pipeline.access_sample_rate
+)
+error_logger = log_pipeline.attach(logging.getLogger(f"{__package__}.errors"), "error.log")
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Resume Skill Extractor API",
@@ -72,152 +87,85 @@ app = FastAPI(
     redoc_url=None   # Disable default redoc
 )
 
-# Add Prometheus middleware
-app.add_route("/metrics", make_asgi_app())
-
-# Initialize Prometheus metrics
-download_counter = Counter(
-    'resume_downloads',
-    'Number of resume downloads',
-    ['status_code', 'method', 'path']
-)
-
-request_latency = Histogram(
-    'request_latency_seconds',
-    'Request latency in seconds',
-    ['method', 'path', 'status_code']
-)
-
-# Add security middleware
-app.add_middleware(HTTPSRedirectMiddleware)
-
-# Add session middleware
-app.add_middleware(
-    SessionMiddleware,
-    secret_key=os.getenv("SECRET_KEY", "your-secret-key"),
-    max_age=3600  # 1 hour
-)
-
-# Add trusted hosts middleware
-app.add_middleware(
-    TrustedHostMiddleware,
-    allowed_hosts=["*"],  # Allow all hosts in production
-)
+# Serve Prometheus metrics; make_asgi_app returns an ASGI app, not a request handler
+app.mount("/metrics", make_asgi_app())
 
 # Initialize FastAPI app with security
 security = HTTPBearer()
 
-# Log server startup
-@app.on_event("startup")
-async def startup_event():
-    logger.info("Server starting up...")
-    try:
-        # Test MongoDB connection
-        client = AsyncIOMotorClient(os.getenv("MONGODB_URI"))
-        await client.server_info()
-        logger.info("MongoDB connection successful")
-    except Exception as e:
-        logger.error(f"MongoDB connection failed: {str(e)}")
-        raise
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("Server shutting down...")
+# Rate limiting per API key (X-API-Key) or client IP. Only keys listed in
+# API_KEYS (comma separated) get their own bucket. The memory backend is
+# per worker; the mongo backend shares counters across workers.
+RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", "100"))
+RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW", "60"))
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+API_KEYS = frozenset(key.strip() for key in os.getenv("API_KEYS", "").split(",") if key.strip())
+if RATE_LIMIT_BACKEND == "off":
+    rate_limiter = None
+elif RATE_LIMIT_BACKEND == "mongo":
+    rate_limiter = MongoWindowLimiter(RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW)
+else:
+    rate_limiter = TokenBucketLimiter(RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW)
 
-# Configure CORS with security
+# Middleware layers, outermost first. Each can be switched off by leaving
+# it out of MIDDLEWARE ("trusted_host" and "session" are available but off
+# by default). All of them are plain ASGI middleware, so a request only
+# pays for the layers that are enabled; see benchmarks/middleware_stack.py.
+DEFAULT_MIDDLEWARE = "metrics,access_log,https_redirect,cors,security_headers,rate_limit,body_limit,gzip"
+MIDDLEWARE = [layer.strip() for layer in os.getenv("MIDDLEWARE", DEFAULT_MIDDLEWARE).split(",") if layer.strip()]
 allowed_origins = os.getenv("ALLOWED_ORIGINS", "https://resume-extractor-frontend.onrender.com").split(',')
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=allowed_origins,
-    allow_credentials=True,
-    allow_methods=["GET", "POST"],  # Only allow specific methods
-    allow_headers=["Authorization", "Content-Type"],  # Only allow specific headers
-    expose_headers=["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"]
-)
+trusted_hosts = os.getenv("TRUSTED_HOSTS", "*").split(",")
+# Largest accepted /upload body: one 10MB file plus multipart framing
+UPLOAD_BODY_LIMIT = int(os.getenv("UPLOAD_BODY_LIMIT", str(10 * 1024 * 1024 + 64 * 1024)))
+# Whole multipart body of /upload/batch; files are spooled to disk as they arrive
+BATCH_BODY_LIMIT = int(os.getenv("BATCH_BODY_LIMIT", str(200 * 1024 * 1024)))
 
-# Add security headers middleware
-@app.middleware("http")
-async def add_security_headers(request: Request, call_next):
-    response = await call_next(request)
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    return response
-
-# Add rate limiting middleware
-@app.middleware("http")
-async def rate_limit_middleware(request: Request, call_next):
-    if request.method in ["GET", "POST"]:
-        try:
-            rate_limit = int(os.getenv("RATE_LIMIT_REQUESTS", "100"))
-            window = int(os.getenv("RATE_LIMIT_WINDOW", "60"))
-            
-            @limits(calls=rate_limit, period=window)
-            async def limited():
-                return await call_next(request)
-            
-            return await limited()
-        except RateLimitException:
-            raise HTTPException(
-                status_code=429,
-                detail="Too many requests. Please try again later."
+def add_middleware_layer(layer: str):
+    if layer == "metrics":
+        app.add_middleware(MetricsMiddleware)
+    elif layer == "access_log":
+        app.add_middleware(AccessLogMiddleware, access_logger=access_logger)
+    elif layer == "https_redirect":
+        app.add_middleware(HTTPSRedirectMiddleware)
+    elif layer == "trusted_host":
+        app.add_middleware(TrustedHostMiddleware, allowed_hosts=trusted_hosts)
+    elif layer == "cors":
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=allowed_origins,
+            allow_credentials=True,
+            allow_methods=["GET", "POST"],  # Only allow specific methods
+            allow_headers=["Authorization", "Content-Type", "X-API-Key"],  # Only allow specific headers
+            expose_headers=["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "Retry-After", "X-Next-Cursor", "Link"]
+        )
+    elif layer == "security_headers":
+        app.add_middleware(SecurityHeadersMiddleware)
+    elif layer == "rate_limit":
+        if rate_limiter is not None:
+            app.add_middleware(
+                RateLimitMiddleware, limiter=rate_limiter, trust_proxy=RATE_LIMIT_TRUST_PROXY,
+                logger=logger, api_keys=API_KEYS
             )
-    return await call_next(request)
-
-# Add request logging middleware with metrics
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    
-    try:
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        
-        # Update Prometheus metrics
-        download_counter.labels(
-            status_code=str(response.status_code),
-            method=request.method,
-            path=str(request.url.path)
-        ).inc()
-        
-        request_latency.labels(
-            method=request.method,
-            path=str(request.url.path),
-            status_code=str(response.status_code)
-        ).observe(process_time)
-        
-        logger.info(
-            f"{request.method} {request.url.path} - {response.status_code} - {process_time:.2f}s"
+    elif layer == "body_limit":
+        app.add_middleware(
+            BodySizeLimitMiddleware,
+            limits={"/upload": UPLOAD_BODY_LIMIT, "/upload/batch": BATCH_BODY_LIMIT}
         )
-        return response
-    except Exception as e:
-        process_time = time.time() - start_time
-        logger.error(
-            f"{request.method} {request.url.path} - ERROR - {process_time:.2f}s - {str(e)}"
+    elif layer == "gzip":
+        app.add_middleware(GZipMiddleware, minimum_size=1000)
+    elif layer == "session":
+        app.add_middleware(
+            SessionMiddleware,
+            secret_key=os.getenv("SECRET_KEY", "your-secret-key"),
+            max_age=3600  # 1 hour
         )
-        raise
-
-# Add GZip middleware for better performance
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+    else:
+        raise ValueError(f"Unknown middleware layer: {layer}")
 
-# Add rate limiting decorator
-FIVE_MINUTES = 300
-
-def rate_limited(limit: int):
-    def decorator(func):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            try:
-                return await func(*args, **kwargs)
-            except RateLimitException:
-                raise HTTPException(
-                    status_code=429,
-                    detail="Too many requests. Please try again later."
-                )
-        return wrapper
-    return decorator
+# add_middleware puts each new layer outside the previous ones
+for layer in reversed(MIDDLEWARE):
+    add_middleware_layer(layer)
 
 # Error handling middleware
 @app.exception_handler(HTTPException)
@@ -238,12 +186,12 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     error_id = str(uuid.uuid4())
-    logger.error(f"Unexpected error ({error_id}): {str(exc)}\n{traceback.format_exc()}")
+    error_traceback = traceback.format_exc()
+    logger.error(f"Unexpected error ({error_id}): {str(exc)}\n{error_traceback}")
     
-    # Log detailed error information
-    error_details = {
+    # Log detailed error information as one JSON line in error.log
+    error_logger.error("Unhandled exception", extra={"fields": {
         "error_id": error_id,
-        "timestamp": datetime.now().isoformat(),
         "request": {
             "method": request.method,
             "url": str(request.url),
@@ -253,13 +201,9 @@ async def general_exception_handler(request: Request, exc: Exception):
         "exception": {
             "type": type(exc).__name__,
             "message": str(exc),
-            "traceback": traceback.format_exc()
+            "traceback": error_traceback
         }
-    }
-    
-    # Log to file with detailed information
-    with open("error.log", "a") as f:
-        f.write(json.dumps(error_details, indent=2) + "\n")
+    }})
     
     return JSONResponse(
         status_code=500,
@@ -277,22 +221,61 @@ async def general_exception_handler(request: Request, exc: Exception):
 # Add startup event handler
 @app.on_event("startup")
 async def startup_event():
+    global nlp_warm_up_task, taxonomy_watch_task, skill_index_task, similarity_index_task
+    log_pipeline.start()
     logger.info("Server starting up...")
+    report = StartupReport()
     try:
-        # Initialize MongoDB connection
-        client = AsyncIOMotorClient(os.getenv("MONGODB_URI"))
-        await client.server_info()
-        logger.info("MongoDB connection successful")
-        
-        # Initialize NLTK data
-        try:
-            import nltk
-            nltk.download("punkt")
-            logger.info("NLTK data initialized successfully")
-        except Exception as e:
-            logger.error(f"Error initializing NLTK data: {str(e)}")
-            raise
+        # Initialize the shared MongoDB client for this worker
+        with report.timed("mongo"):
+            await mongo.connect()
+        resumes = mongo.db.resumes
+        taxonomy_store.collection = mongo.db.skills
+        taxonomy_store.state_collection = mongo.db.taxonomy_state
+        if isinstance(job_store, MongoJobStore):
+            job_store.collection = mongo.db.jobs
+        if result_cache.persistent:
+            result_cache.collection = mongo.db.extraction_cache
+            with report.timed("indexes"):
+                await result_cache.ensure_indexes()
+        if isinstance(rate_limiter, MongoWindowLimiter):
+            rate_limiter.collection = mongo.db.rate_limits
+            with report.timed("indexes"):
+                await rate_limiter.ensure_indexes()
+
+        # Start the PDF extraction worker pool
+        with report.timed("pdf_engine"):
+            pdf_engine.start()
+
+        with report.timed("indexes"):
+            # Content hash (re-uploads) and search indexes
+            await ensure_resume_indexes(resumes)
+            if isinstance(job_store, MongoJobStore):
+                await job_store.ensure_indexes()
+
+        # Start the background job workers
+        job_queue.start()
+
+        # Load and warm up the NLP model without holding up startup;
+        # /health reports "starting" until it is ready
+        nlp_warm_up_task = asyncio.create_task(warm_up_nlp())
+
+        # Compile the skill taxonomy and optionally watch it for changes
+        with report.timed("taxonomy"):
+            await taxonomy_store.reload()
+        # Also picks up reloads published by other workers
+        watch_interval = float(os.getenv("SKILL_TAXONOMY_WATCH_INTERVAL", "30"))
+        if watch_interval > 0:
+            taxonomy_watch_task = asyncio.create_task(taxonomy_store.watch(watch_interval))
         
+        # Build the in-memory skill and similarity indexes in the background
+        if SKILL_INDEX_ENABLED:
+            skill_index_task = asyncio.create_task(build_resume_index(skill_index))
+        if SIMILARITY_INDEX_ENABLED:
+            similarity_index_task = asyncio.create_task(build_resume_index(similarity_index))
+
+        report.log()
+
     except Exception as e:
         logger.error(f"Startup error: {str(e)}")
         raise
@@ -302,44 +285,26 @@ async def startup_event():
 async def shutdown_event():
     logger.info("Server shutting down...")
     try:
-        # Close MongoDB connection
-        if "client" in globals():
-            client.close()
-            logger.info("MongoDB connection closed")
-        
-    except Exception as e:
-        logger.error(f"Shutdown error: {str(e)}")
-        raise
+        # Stop the background job workers, then the PDF extraction pool
+        await job_queue.shutdown()
+        pdf_engine.shutdown()
+        nlp_executor.shutdown()
 
-# Add request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    
-    try:
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        
-        # Log request details
-        log_data = {
-            "timestamp": datetime.now().isoformat(),
-            "method": request.method,
-            "url": str(request.url),
-            "status_code": response.status_code,
-            "processing_time": process_time,
-            "client": request.client.host if request.client else "unknown",
-            "user_agent": request.headers.get("user-agent", "unknown")
-        }
-        
-        # Log to file
-        with open("access.log", "a") as f:
-            f.write(json.dumps(log_data, indent=2) + "\n")
+        # Stop watching the skill taxonomy and refreshing the resume indexes
+        if taxonomy_watch_task is not None:
+            taxonomy_watch_task.cancel()
+        for task in (skill_index_task, similarity_index_task):
+            if task is not None:
+                task.cancel()
+
+        # Close the MongoDB client last; the tasks above may still use it
+        mongo.close()
+
+        # Write out any queued log records
+        log_pipeline.stop()
         
-        logger.info(f"{request.method} {request.url} - {response.status_code} - {process_time:.2f}s")
-        return response
     except Exception as e:
-        process_time = time.time() - start_time
-        logger.error(f"{request.method} {request.url} - ERROR - {process_time:.2f}s - {str(e)}")
+        logger.error(f"Shutdown error: {str(e)}")
         raise
 
 # Add static files serving
@@ -371,9 +336,34 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         content={"detail": exc.errors(), "body": exc.body}
     )
 
+async def warm_up_nlp():
+    try:
+        # Already done in the master when it preloaded the app
+        if not nlp_backend.ready:
+            await asyncio.to_thread(nlp_backend.warm_up)
+        # In process mode the workers fork from the warmed-up model
+        await nlp_executor.start()
+    except Exception as e:
+        logger.error(f"Error loading Spacy model: {str(e)}")
+
+def preload():
+    """Load shared state once in the gunicorn master (see gunicorn.conf.py)"""
+    # Write out the master's records before forking, so they are not
+    # inherited by (and written again from) every worker's queue
+    log_pipeline.start()
+    try:
+        preload_shared_state(nlp_backend, StartupReport())
+    finally:
+        log_pipeline.stop()
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
+    if not nlp_backend.ready:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "starting", "timestamp": datetime.utcnow().isoformat()}
+        )
     return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
 
 # OpenAPI documentation
@@ -390,43 +380,47 @@ async def custom_swagger_ui_html():
 async def root():
     return {"message": "Welcome to Resume Skill Extractor API"}
 
-# Database connection
-async def get_db():
-    try:
-        client = AsyncIOMotorClient(os.getenv("MONGODB_URI"))
-        db = client.resume_extractor
-        yield db
-    finally:
-        client.close()
+# Admin endpoints
+async def require_admin(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token or credentials.credentials != admin_token:
+        raise HTTPException(status_code=403, detail="Admin access required")
 
-# MongoDB connection
-client = AsyncIOMotorClient(os.getenv("MONGODB_URI", "mongodb://localhost:27017"))
-db = client.resume_extractor
-resumes = db.resumes
+@app.post("/admin/taxonomy/reload", dependencies=[Depends(require_admin)])
+async def reload_taxonomy():
+    """Reload the skill taxonomy without restarting workers.
 
-# Load NLP model
-try:
-    # Try to load the model
-    nlp = spacy.load("en_core_web_sm")
-    logger.info("Spacy model loaded successfully")
-except Exception as e:
-    logger.error(f"Error loading Spacy model: {str(e)}")
-    # Try to download and load again
+    This worker reloads at once; the others follow within
+    SKILL_TAXONOMY_WATCH_INTERVAL seconds.
+    """
     try:
-        import spacy.cli
-        spacy.cli.download("en_core_web_sm")
-        nlp = spacy.load("en_core_web_sm")
-        logger.info("Spacy model downloaded and loaded successfully")
-    except Exception as e2:
-        logger.error(f"Failed to download and load Spacy model: {str(e2)}")
-        raise
+        taxonomy = await taxonomy_store.reload(publish=True)
+    except Exception as e:
+        logger.error(f"Error reloading skill taxonomy: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to reload taxonomy: {str(e)}")
+    return {
+        "skills": len(taxonomy),
+        "patterns": taxonomy.matcher.pattern_count,
+        "source": taxonomy_store.source
+    }
+
+# Database connection, one pooled client per worker opened on startup
+mongo = MongoManager()
+
+def get_db() -> AsyncIOMotorDatabase:
+    return mongo.db
 
-# Predefined skill list
-SKILLS = [
-    "Python", "JavaScript", "Java", "C++", "C#", "React", "Node.js",
-    "Angular", "Vue.js", "Django", "Flask", "SQL", "MongoDB",
-    "PostgreSQL", "AWS", "Docker", "Kubernetes", "Git", "CI/CD"
-]
+def get_resumes_collection() -> AsyncIOMotorCollection:
+    return mongo.db.resumes
+
+# NLP model, loaded and warmed up in the background during startup
+nlp_backend = NlpBackend()
+nlp_executor = NlpExecutor(nlp_backend)
+nlp_warm_up_task = None
+
+# Skill taxonomy (file or Mongo backed), compiled into an index on startup
+taxonomy_store = TaxonomyStore()
+taxonomy_watch_task = None
 
 class Resume(BaseModel):
     _id: str
@@ -448,269 +442,852 @@ class Resume(BaseModel):
         }
 
 @app.delete("/resumes/{resume_id}")
-async def delete_resume(resume_id: str):
+async def delete_resume(
+    resume_id: str,
+    resumes: AsyncIOMotorCollection = Depends(get_resumes_collection)
+):
     """Delete a resume by ID"""
     try:
         # Convert string ID to ObjectId
         object_id = ObjectId(resume_id)
         
         # Delete the resume
-        result = await resumes.delete_one({"_id": object_id})
+        deleted = await resumes.find_one_and_delete({"_id": object_id}, {"content_hash": 1, "skills": 1})
         
-        if result.deleted_count == 0:
+        if deleted is None:
             raise HTTPException(status_code=404, detail="Resume not found")
+
+        if deleted.get("content_hash"):
+            dedup_cache.pop(deleted["content_hash"])
+        skill_index.remove(resume_id, deleted.get("skills", []))
+        similarity_index.remove(resume_id)
             
         return {"message": "Resume deleted successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error deleting resume: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Content-hash deduplication of uploads
+dedup_cache = LRUCache(int(os.getenv("DEDUP_CACHE_SIZE", "10000")))
+
+# Extraction results by extracted text, for uploads that differ only in bytes
+result_cache = ResultCache()
+
+def content_hash(content: bytes) -> str:
+    """SHA-256 of the uploaded bytes, used to recognise re-uploads"""
+    return hashlib.sha256(content).hexdigest()
+
+async def find_duplicates(digests: List[str]) -> Dict[str, str]:
+    """Map content hashes that are already stored to their resume ids.
+
+    The cache is per worker and may name a resume another worker deleted,
+    so cached ids are confirmed by _id in the same query as the lookup of
+    the uncached hashes.
+    """
+    found = {}
+    if not digests:
+        return found
+    cached = {}
+    missing = []
+    for digest in digests:
+        resume_id = dedup_cache.get(digest)
+        if resume_id is not None:
+            cached[digest] = resume_id
+        else:
+            missing.append(digest)
+
+    query = {"content_hash": {"$in": missing}}
+    if cached:
+        query = {"$or": [query, {"_id": {"$in": [ObjectId(resume_id) for resume_id in cached.values()]}}]}
+    async for resume in mongo.db.resumes.find(query, {"content_hash": 1}):
+        digest, resume_id = resume.get("content_hash"), str(resume["_id"])
+        if cached.get(digest) == resume_id:
+            found[digest] = resume_id
+            dedup_hits.labels(layer="memory").inc()
+        elif digest in missing:
+            found[digest] = resume_id
+            dedup_cache.set(digest, resume_id)
+            dedup_hits.labels(layer="database").inc()
+
+    stale = [digest for digest in cached if digest not in found]
+    if stale:
+        for digest in stale:
+            dedup_cache.pop(digest)
+        # The same bytes may have been stored again under a new id
+        cursor = mongo.db.resumes.find({"content_hash": {"$in": stale}}, {"content_hash": 1})
+        async for resume in cursor:
+            found[resume["content_hash"]] = str(resume["_id"])
+            dedup_cache.set(resume["content_hash"], str(resume["_id"]))
+            dedup_hits.labels(layer="database").inc()
+    dedup_misses.inc(len(digests) - len(found))
+    return found
+
+async def process_resume(source: PdfSource, size: int, digest: str, progress=None,
+                         timings: Optional[StageTimings] = None) -> str:
+    """Extract, analyze and store one resume; returns the new resume id.
+
+    ``source`` is the PDF bytes or the path of a spooled upload.
+    """
+    async def report(stage: str, percent: int):
+        if progress is not None:
+            await progress(stage, percent)
+
+    timings = timings or StageTimings()
+    try:
+        return await extract_and_save_resume(source, digest, report, timings)
+    finally:
+        # Published whether or not the upload succeeded, so slow failures show up too
+        pages = timings.page_count
+        timings.observe(size, pages)
+        totals = timings.totals()
+        logger.info(
+            f"Extraction timings ({size} bytes, {pages} pages): "
+            + ", ".join(f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in totals.items()),
+            extra={"fields": {"bytes": size, "pages": pages, "stages": totals}}
+        )
+
+async def extract_and_save_resume(source: PdfSource, digest: str, report, timings: StageTimings) -> str:
+    # Extract text from PDF
+    await report("extracting", 10)
+    try:
+        pages = await extract_pages_from_pdf(source, timings=timings)
+    except PdfEngineBusy as e:
+        logger.error(f"PDF extraction queue full: {str(e)}")
+        raise HTTPException(status_code=503, detail="Server busy. Please try again later.")
+    except Exception as e:
+        logger.error(f"Error extracting text: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to extract text: {str(e)}")
+    try:
+        require_text(pages)
+    except ExtractionError as e:
+        logger.error(str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Extract resume data
+    await report("analyzing", 40)
+    try:
+        data = await analyze_pages(pages, timings)
+        data["uploaded_at"] = datetime.utcnow()
+        data["content_hash"] = digest
+    except NlpBusy as e:
+        logger.error(f"NLP queue full: {str(e)}")
+        raise HTTPException(status_code=503, detail="Server busy. Please try again later.")
+    except NlpTimeout as e:
+        logger.error(f"Resume analysis timed out: {str(e)}")
+        raise HTTPException(status_code=504, detail="Resume analysis timed out")
+    except Exception as e:
+        logger.error(f"Error extracting resume data: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Failed to extract resume data: {str(e)}")
+
+    # Save to database
+    await report("saving", 80)
+    try:
+        with timings.stage("mongo_write"):
+            result = await save_resume(data)
+        logger.info(f"Resume saved successfully with ID: {result.inserted_id}")
+        dedup_cache.set(digest, str(result.inserted_id))
+        skill_index.add(str(result.inserted_id), data["skills"])
+        similarity_index.add(str(result.inserted_id), data["skills"])
+        return str(result.inserted_id)
+    except DuplicateKeyError:
+        # The same file was stored concurrently by another request
+        existing = await find_duplicates([digest])
+        if digest in existing:
+            return existing[digest]
+        raise HTTPException(status_code=500, detail="Failed to save resume")
+    except Exception as e:
+        logger.error(f"Error saving to database: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to save resume: {str(e)}")
+
+def cacheable_result(data: dict) -> dict:
+    """Resume data without the per-upload fields"""
+    return {key: value for key, value in data.items() if key not in ("uploaded_at", "content_hash")}
+
+async def analyze_pages(pages: List[str], timings: StageTimings) -> dict:
+    """Resume data for extracted pages, reusing the result cached for the same text.
+
+    Byte-different PDFs (other metadata or producer) that extract to the
+    same text skip fields, skill matching and NER entirely.
+    """
+    with timings.stage("fingerprint"):
+        key = text_fingerprint(pages, taxonomy_store.current.version)
+    data = await result_cache.get(key)
+    if data is None:
+        data = await extract_resume_data(pages, timings)
+        await result_cache.set(key, cacheable_result(data))
+    return data
+
+async def run_resume_job(payload: Dict[str, Any], progress) -> Dict[str, Any]:
+    """Job queue handler for asynchronous uploads"""
+    upload = payload["upload"]
+    try:
+        resume_id = await process_resume(
+            upload.source, upload.size, upload.digest, progress, payload.get("timings")
+        )
+    finally:
+        upload.close()
+    return {"id": resume_id}
+
+def discard_resume_job(payload: Dict[str, Any]):
+    """Release the upload of a job dropped before it ran"""
+    payload["upload"].close()
+
+# Upload settings. Uploads above the spool threshold are written to a
+# temporary file and parsed from disk instead of being held in memory.
+MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB per resume
+UPLOAD_SPOOL_THRESHOLD = int(os.getenv("UPLOAD_SPOOL_THRESHOLD", str(2 * 1024 * 1024)))
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None
+
+# Background job queue for asynchronous uploads
+if os.getenv("JOB_STORE", "mongo").lower() == "memory":
+    job_store = MemoryJobStore()
+else:
+    job_store = MongoJobStore(ttl_seconds=int(os.getenv("JOB_TTL_SECONDS", "86400")))
+job_queue = JobQueue(job_store, run_resume_job, discard_resume_job)
+
 @app.post("/upload")
 async def upload_resume(
-    file: UploadFile = File(..., description="PDF file to upload")
+    file: UploadFile = File(..., description="PDF file to upload"),
+    async_mode: bool = Query(False, alias="async", description="Process in the background and return a job id")
 ):
+    timings = StageTimings()
+    upload = None
     try:
-        # Validate file type using filetype
-        file_type = filetype.guess(await file.read(1024))
-        if not file_type or file_type.mime != 'application/pdf':
-            logger.error(f"Invalid file type: {file_type.mime if file_type else 'None'}")
+        # Stream the body in chunks: the type is sniffed from the first
+        # chunk, the hash is computed as it arrives and reading stops as
+        # soon as the size limit is passed
+        try:
+            upload = await read_upload(
+                file, MAX_FILE_SIZE, UPLOAD_SPOOL_THRESHOLD, UPLOAD_SPOOL_DIR,
+                expected_mime="application/pdf", timings=timings
+            )
+        except UnsupportedUploadType as e:
+            logger.error(f"Invalid file type: {str(e)}")
             raise HTTPException(
                 status_code=400,
                 detail="Only PDF files are allowed"
             )
-            
-        # Reset file pointer
-        await file.seek(0)
-        
-        # Check file size
-        if file.size > 10 * 1024 * 1024:  # 10MB limit
-            logger.error(f"File too large: {file.size/1024/1024:.2f}MB")
+        except UploadTooLarge:
+            logger.error(f"File too large: {file.filename}")
             raise HTTPException(
                 status_code=413,
                 detail="File too large. Maximum file size is 10MB"
             )
             
         logger.info(f"Processing file: {file.filename}")
-        
-        # Read and process PDF
-        content = await file.read()
-        
-        # Extract text from PDF
-        try:
-            text = await extract_text_from_pdf(content)
-            if not text:
-                logger.error("Failed to extract text from PDF")
-                raise HTTPException(status_code=400, detail="Failed to extract text from PDF")
-        except Exception as e:
-            logger.error(f"Error extracting text: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Failed to extract text: {str(e)}")
-            
-        # Extract resume data
-        try:
-            data = await extract_resume_data(text)
-            data["uploaded_at"] = datetime.now().isoformat()
-        except Exception as e:
-            logger.error(f"Error extracting resume data: {str(e)}")
-            raise HTTPException(status_code=400, detail=f"Failed to extract resume data: {str(e)}")
-        
-        # Save to database
-        try:
-            result = await save_resume(data)
-            logger.info(f"Resume saved successfully with ID: {result.inserted_id}")
-            return {"id": str(result.inserted_id)}
-        except Exception as e:
-            logger.error(f"Error saving to database: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Failed to save resume: {str(e)}")
+
+        # Re-uploads of a stored file skip extraction entirely
+        digest = upload.digest
+        existing = await find_duplicates([digest])
+        if digest in existing:
+            logger.info(f"Duplicate upload of resume {existing[digest]}: {file.filename}")
+            return {"id": existing[digest], "duplicate": True}
+
+        if async_mode:
+            try:
+                job_id = await job_queue.submit(
+                    {"upload": upload, "timings": timings},
+                    filename=file.filename
+                )
+            except JobQueueFull:
+                raise HTTPException(status_code=503, detail="Server busy. Please try again later.")
+            # The job now owns the upload and releases it when done
+            upload = None
+            logger.info(f"Queued job {job_id} for file: {file.filename}")
+            return JSONResponse(
+                status_code=202,
+                content={"job_id": job_id, "status": "queued", "status_url": f"/jobs/{job_id}"}
+            )
+
+        return {"id": await process_resume(upload.source, upload.size, digest, timings=timings)}
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Unexpected error processing resume: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
+    finally:
+        if upload is not None:
+            upload.close()
 
-async def extract_text_from_pdf(pdf_content: bytes) -> str:
-    """Extract text from PDF content"""
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Report the status, progress and result of an upload job"""
+    job = await job_store.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_to_response(job)
+
+# Batch upload settings
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "500"))
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "32"))
+BATCH_INSERT_SIZE = int(os.getenv("BATCH_INSERT_SIZE", "100"))
+
+def file_size(file: UploadFile) -> int:
+    """Size of an upload; Starlette has already spooled it to memory or disk"""
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(0)
+    return size
+
+async def list_batch_files(files: List[UploadFile], archives: List[zipfile.ZipFile]) -> List[Dict[str, Any]]:
+    """List the PDFs in uploaded files and zip archives without reading them.
+
+    Each item gets a ``read`` function that returns its content; items are
+    read one chunk at a time by load_batch_chunk. Opened archives are
+    appended to ``archives`` for the caller to close. The file count is
+    checked against each archive's directory before any member is read.
+    """
+    items = []
+    for file in files:
+        head = await file.read(1024)
+        await file.seek(0)
+        kind = filetype.guess(head)
+        mime = kind.mime if kind else None
+        if mime == 'application/zip':
+            try:
+                archive = zipfile.ZipFile(file.file)
+            except zipfile.BadZipFile:
+                items.append({"filename": file.filename, "error": "Invalid zip archive"})
+                continue
+            archives.append(archive)
+            members = [
+                member for member in archive.infolist()
+                if not member.is_dir() and member.filename.lower().endswith('.pdf')
+            ]
+            if len(items) + len(members) > BATCH_MAX_FILES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Too many files. Maximum batch size is {BATCH_MAX_FILES}"
+                )
+            for member in members:
+                name = f"{file.filename}/{member.filename}"
+                if member.file_size > MAX_FILE_SIZE:
+                    items.append({"filename": name, "error": "File too large. Maximum file size is 10MB"})
+                else:
+                    items.append({
+                        "filename": name,
+                        "read": lambda archive=archive, member=member: run_in_threadpool(archive.read, member)
+                    })
+            continue
+        if mime != 'application/pdf':
+            items.append({"filename": file.filename, "error": "Only PDF files are allowed"})
+        elif file_size(file) > MAX_FILE_SIZE:
+            items.append({"filename": file.filename, "error": "File too large. Maximum file size is 10MB"})
+        else:
+            items.append({"filename": file.filename, "read": file.read})
+        if len(items) > BATCH_MAX_FILES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Too many files. Maximum batch size is {BATCH_MAX_FILES}"
+            )
+    return items
+
+async def load_batch_chunk(items: List[Dict[str, Any]], first_seen: Dict[str, Dict[str, Any]]):
+    """Read a chunk's files and skip those already stored or seen earlier in the batch"""
+    candidates = []
+    for item in items:
+        read = item.pop("read", None)
+        if read is None:
+            continue
+        try:
+            item["content"] = await read()
+        except (OSError, zipfile.BadZipFile) as e:
+            item["error"] = f"Failed to read file: {str(e)}"
+            continue
+        digest = item["content_hash"] = content_hash(item["content"])
+        if digest in first_seen:
+            item["duplicate_of"] = first_seen[digest]
+            item["duplicate"] = True
+            del item["content"]
+        else:
+            first_seen[digest] = item
+            candidates.append(item)
+    existing = await find_duplicates([item["content_hash"] for item in candidates])
+    for item in candidates:
+        if item["content_hash"] in existing:
+            item["id"] = existing[item["content_hash"]]
+            item["duplicate"] = True
+            del item["content"]
+
+async def prepare_batch_chunk(items: List[Dict[str, Any]], first_seen: Dict[str, Dict[str, Any]]):
+    await load_batch_chunk(items, first_seen)
+    await extract_batch_texts(items)
+
+async def extract_batch_texts(items: List[Dict[str, Any]]):
+    """Extract text for every item in a chunk, concurrently on the PDF pool"""
+    async def extract(item):
+        if "content" not in item:
+            return
+        try:
+            content = item.pop("content")
+            item["size"] = len(content)
+            item["timings"] = StageTimings()
+            pages = await extract_pages_from_pdf(content, wait=True, timings=item["timings"])
+        except ExtractionError as e:
+            item["error"] = f"Failed to extract text: {str(e)}"
+            return
+        try:
+            item["pages"] = require_text(pages)
+        except ExtractionError as e:
+            item["error"] = str(e)
+
+    await asyncio.gather(*(extract(item) for item in items))
+
+async def analyze_batch_texts(items: List[Dict[str, Any]]):
+    """Build resume data for a chunk, running NER on the NLP executor for uncached texts"""
+    pending = []
+    version = taxonomy_store.current.version
+    for item in items:
+        if "pages" not in item or "error" in item:
+            continue
+        with item["timings"].stage("fingerprint"):
+            item["fingerprint"] = text_fingerprint(item["pages"], version)
+        cached = await result_cache.get(item["fingerprint"])
+        if cached is None:
+            pending.append(item)
+            continue
+        item["data"] = cached
+        item["data"]["uploaded_at"] = datetime.utcnow()
+        item["data"]["content_hash"] = item["content_hash"]
+        item.pop("timings").observe(item.pop("size"), len(item.pop("pages")))
+    if not pending:
+        return
+
+    start_time = time.perf_counter()
     try:
-        # Create a temporary file to process with PyMuPDF
-        with open("temp.pdf", "wb") as f:
-            f.write(pdf_content)
-        
-        # Open and extract text
-        pdf_document = fitz.open("temp.pdf")
-        text = ""
-        for page in pdf_document:
-            text += page.get_text()
-        
-        # Clean up
-        pdf_document.close()
-        os.remove("temp.pdf")
-        
-        return text.strip()
-    except Exception as e:
-        logger.error(f"Error extracting text from PDF: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+        organizations = await nlp_executor.organizations_many(
+            ["".join(item["pages"]) for item in pending], wait=True
+        )
+    except NlpTimeout as e:
+        logger.error(f"Batch NER timed out: {str(e)}")
+        for item in pending:
+            item["error"] = "Resume analysis timed out"
+        return
+    # NER runs over the whole chunk at once; charge each document an equal share
+    ner_seconds = (time.perf_counter() - start_time) / len(pending)
+    await run_in_threadpool(build_batch_data, pending, organizations, ner_seconds)
+    for item in pending:
+        if "data" in item and "error" not in item:
+            await result_cache.set(item["fingerprint"], cacheable_result(item["data"]))
+
+def build_batch_data(pending: List[Dict[str, Any]], organizations: List[List[str]], ner_seconds: float):
+    taxonomy = taxonomy_store.current
+    for item, companies in zip(pending, organizations):
+        timings = item.pop("timings")
+        pages = item.pop("pages")
+        timings.add("ner", ner_seconds)
+        try:
+            item["data"] = build_resume_data(pages, companies, taxonomy, timings)
+            validate_resume_data(item["data"])
+        except ValueError as e:
+            item["error"] = f"Failed to extract resume data: {str(e)}"
+        else:
+            item["data"]["content_hash"] = item["content_hash"]
+        timings.observe(item.pop("size"), len(pages))
+
+async def save_batch(items: List[Dict[str, Any]]):
+    """Insert extracted resumes with insert_many in chunks"""
+    pending = [item for item in items if "data" in item and "error" not in item]
+    taxonomy = taxonomy_store.current
+    for start in range(0, len(pending), BATCH_INSERT_SIZE):
+        chunk = pending[start:start + BATCH_INSERT_SIZE]
+        documents = [encode_resume(item["data"], taxonomy) for item in chunk]
+        start_time = time.perf_counter()
+        try:
+            result = await mongo.db.resumes.insert_many(documents, ordered=False)
+            for item, inserted_id in zip(chunk, result.inserted_ids):
+                item["id"] = str(inserted_id)
+                dedup_cache.set(item["data"]["content_hash"], item["id"])
+                skill_index.add(item["id"], item["data"]["skills"])
+                similarity_index.add(item["id"], item["data"]["skills"])
+        except BulkWriteError as e:
+            # Unordered inserts keep going past failures; map errors back by index
+            errors = {error["index"]: error for error in e.details.get("writeErrors", [])}
+            # Files stored concurrently by another request are duplicates, as in /upload
+            existing = await find_duplicates([
+                chunk[index]["data"]["content_hash"] for index, error in errors.items() if error.get("code") == 11000
+            ])
+            failed = [index for index in errors if chunk[index]["data"]["content_hash"] not in existing]
+            if failed:
+                logger.error(f"Error saving resume batch: {len(failed)} of {len(chunk)} inserts failed")
+            for index, item in enumerate(chunk):
+                if index in errors:
+                    digest = item["data"]["content_hash"]
+                    if digest in existing:
+                        item["id"] = existing[digest]
+                        item["duplicate"] = True
+                    else:
+                        item["error"] = f"Failed to save resume: {errors[index]['errmsg']}"
+                else:
+                    item["id"] = str(documents[index]["_id"])
+                    dedup_cache.set(item["data"]["content_hash"], item["id"])
+                    skill_index.add(item["id"], item["data"]["skills"])
+                    similarity_index.add(item["id"], item["data"]["skills"])
+        except Exception as e:
+            logger.error(f"Error saving resume batch: {str(e)}")
+            for item in chunk:
+                item["error"] = f"Failed to save resume: {str(e)}"
+        finally:
+            stage_seconds.labels(stage="mongo_bulk_write", size="batch").observe(
+                time.perf_counter() - start_time
+            )
+
+@app.post("/upload/batch")
+async def upload_resume_batch(
+    files: List[UploadFile] = File(..., description="PDF files or zip archives of PDFs")
+):
+    """Process many resumes in one request.
+
+    Files are read and handled in chunks of BATCH_CHUNK_SIZE, so at most two
+    chunks of content are held at a time: reading and text extraction for
+    the next chunk run on the PDF pool while spaCy (nlp.pipe) and the bulk
+    insert for the current chunk are in progress. Files that are already
+    stored or repeated within the batch are skipped.
+    """
+    archives: List[zipfile.ZipFile] = []
+    next_chunk: Optional[asyncio.Task] = None
+    try:
+        items = await list_batch_files(files, archives)
+        logger.info(f"Processing batch of {len(items)} files")
+
+        first_seen: Dict[str, Dict[str, Any]] = {}
+        chunks = [items[i:i + BATCH_CHUNK_SIZE] for i in range(0, len(items), BATCH_CHUNK_SIZE)]
+        next_chunk = asyncio.create_task(prepare_batch_chunk(chunks[0], first_seen)) if chunks else None
+        for index, chunk in enumerate(chunks):
+            await next_chunk
+            if index + 1 < len(chunks):
+                next_chunk = asyncio.create_task(prepare_batch_chunk(chunks[index + 1], first_seen))
+            await analyze_batch_texts(chunk)
+            await save_batch(chunk)
+    finally:
+        # A failed chunk leaves the next one in flight; stop it before closing its archives
+        if next_chunk is not None:
+            next_chunk.cancel()
+            await asyncio.gather(next_chunk, return_exceptions=True)
+        for archive in archives:
+            archive.close()
+
+    results = []
+    for item in items:
+        original = item.pop("duplicate_of", None)
+        if original is not None:
+            if "error" in original:
+                item["error"] = original["error"]
+            else:
+                item["id"] = original["id"]
+        if "error" in item:
+            results.append({"filename": item["filename"], "status": "error", "error": item["error"]})
+        else:
+            results.append({
+                "filename": item["filename"],
+                "status": "ok",
+                "id": item["id"],
+                "duplicate": item.get("duplicate", False)
+            })
+    succeeded = sum(1 for result in results if result["status"] == "ok")
+    logger.info(f"Batch complete: {succeeded}/{len(results)} resumes saved")
+    return {
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results
+    }
+
+# Listing settings
+RESUMES_PAGE_SIZE = int(os.getenv("RESUMES_PAGE_SIZE", "100"))
+RESUMES_MAX_PAGE_SIZE = int(os.getenv("RESUMES_MAX_PAGE_SIZE", "1000"))
+RESUME_FIELDS = {"name", "email", "phone", "skills", "experience", "uploaded_at", "tags"}
 
+def resume_projection(fields: Optional[str]) -> Optional[Dict[str, int]]:
+    """Turn a comma separated field list into a Mongo projection of stored fields"""
+    if not fields:
+        return None
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - RESUME_FIELDS
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return stored_projection(sorted(requested))
 
+async def stream_resumes_ndjson(cursor):
+    """Yield one JSON document per line so memory stays flat for any collection size"""
+    taxonomy = taxonomy_store.current
+    async for resume in cursor:
+        yield json.dumps(decode_resume(resume, taxonomy), default=str) + "\n"
 
 @app.get("/resumes")
-async def get_resumes():
+async def get_resumes(
+    request: Request,
+    limit: int = Query(RESUMES_PAGE_SIZE, ge=1, le=RESUMES_MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None, description="Return resumes with an id greater than this one"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, e.g. name,email,skills"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="ndjson streams every match"),
+    resumes: AsyncIOMotorCollection = Depends(get_resumes_collection)
+):
+    """List resumes in _id order.
+
+    JSON responses hold one page; when more remain, X-Next-Cursor and a
+    Link header carry the id to pass as ``after``. ``format=ndjson``
+    streams every resume after ``after`` without a page limit, for exports.
+    """
+    query = {}
+    if after:
+        try:
+            query["_id"] = {"$gt": ObjectId(after)}
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    projection = resume_projection(fields)
+
     try:
-        cursor = resumes.find({})
+        if format == "ndjson":
+            cursor = resumes.find(query, projection).sort("_id", 1).batch_size(RESUMES_PAGE_SIZE)
+            return StreamingResponse(stream_resumes_ndjson(cursor), media_type="application/x-ndjson")
+
+        cursor = resumes.find(query, projection).sort("_id", 1).limit(limit)
+        taxonomy = taxonomy_store.current
         resumes_list = []
         async for resume in cursor:
-            resume['_id'] = str(resume['_id'])  # Convert ObjectId to string
-            resumes_list.append(resume)
-        return resumes_list
+            resumes_list.append(decode_resume(resume, taxonomy))
     except Exception as e:
         logger.error(f"Error fetching resumes: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch resumes")
 
+    headers = {}
+    if len(resumes_list) == limit:
+        next_cursor = resumes_list[-1]['_id']
+        next_url = request.url.include_query_params(after=next_cursor)
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<{next_url}>; rel="next"'
+    return JSONResponse(content=jsonable_encoder(resumes_list), headers=headers)
+
+
+# Bulk export settings
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "5000"))
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+@app.get("/export", dependencies=[Depends(require_admin)])
+async def export_resumes(
+    format: str = Query("csv", pattern=f"^({'|'.join(EXPORT_FORMATS)})$"),
+    table: str = Query("resumes", pattern=f"^({'|'.join(EXPORT_TABLES)})$",
+                       description="resumes, skills (one row per skill) or experience (one row per entry)"),
+    since: Optional[datetime] = Query(None, description="Only resumes uploaded at or after this time"),
+    after: Optional[str] = Query(None, description="Only resumes with an id greater than this one"),
+    resumes: AsyncIOMotorCollection = Depends(get_resumes_collection)
+):
+    """Stream a snapshot of the resumes collection as CSV, NDJSON or Parquet.
+
+    The export stops at the newest resume that existed when it started;
+    its id is returned in X-Export-Until. Pass that id as ``after`` on the
+    next run to export only what was added since.
+    """
+    after_id = None
+    if after:
+        try:
+            after_id = ObjectId(after)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    try:
+        writer = open_writer(format, table)
+    except ExportUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    try:
+        query = export_query(since, after_id)
+        newest = await resumes.find_one(query, {"_id": 1}, sort=[("_id", -1)])
+    except Exception as e:
+        logger.error(f"Error starting export: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to export resumes")
+    headers = {"Content-Disposition": f'attachment; filename="{table}.{format}"'}
+    if newest is None:
+        # Nothing to export; a query matching no document still yields the header
+        cursor = resumes.find({"_id": None})
+    else:
+        headers["X-Export-Until"] = str(newest["_id"])
+        cursor = resumes.find(
+            export_query(since, after_id, until=newest["_id"]), PROJECTIONS[table]
+        ).sort("_id", 1).batch_size(EXPORT_BATCH_SIZE)
+    chunks = export_chunks(cursor, writer, table, taxonomy_store.current, EXPORT_CHUNK_ROWS)
+    return StreamingResponse(chunks, media_type=MEDIA_TYPES[format], headers=headers)
+
+
+# Skill search; in-memory inverted index for skill-only queries
+SKILL_INDEX_ENABLED = os.getenv("SKILL_INDEX_ENABLED", "true").lower() == "true"
+skill_index = SkillIndex(key=lambda skill: taxonomy_store.current.skill_key(skill))
+skill_index_task = None
+
+# "More like this"; MinHash LSH over the skill sets of stored resumes
+SIMILARITY_INDEX_ENABLED = os.getenv("SIMILARITY_INDEX_ENABLED", "true").lower() == "true"
+similarity_index = SimilarityIndex(
+    key=lambda skill: taxonomy_store.current.skill_key(skill),
+    max_candidates=int(os.getenv("SIMILARITY_MAX_CANDIDATES", "500"))
+)
+similarity_index_task = None
+
+async def build_resume_index(index: ResumeIndex):
+    """Build an in-memory resume index, then keep it current with other workers' inserts"""
+    try:
+        await index.build(mongo.db.resumes)
+        refresh_interval = float(os.getenv("SKILL_INDEX_REFRESH_INTERVAL", "30"))
+        if refresh_interval > 0:
+            await index.watch(mongo.db.resumes, refresh_interval)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"Error building {index.name.lower()}: {str(e)}")
+
+def resolve_skills(skills: List[str]) -> List[str]:
+    """Map requested skills and aliases to canonical taxonomy names"""
+    taxonomy = taxonomy_store.current
+    return [taxonomy.canonical(skill) or skill for skill in skills]
+
+@app.get("/resumes/search")
+async def search_resumes(
+    skill: List[str] = Query([], description="Required skills; all must match"),
+    name: Optional[str] = Query(None, description="Words to find in the name or experience"),
+    email: Optional[str] = Query(None, description="Exact email address"),
+    limit: int = Query(RESUMES_PAGE_SIZE, ge=1, le=RESUMES_MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None, description="Return resumes with an id greater than this one"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return"),
+    resumes: AsyncIOMotorCollection = Depends(get_resumes_collection)
+):
+    """Find resumes by skills, name and email.
+
+    Skill-only queries are answered from the in-memory skill index and the
+    page of matching ids is then read from Mongo; everything else is a
+    Mongo query on the skills multikey index, the text index and the email
+    index.
+    """
+    if not (skill or name or email):
+        raise HTTPException(status_code=400, detail="At least one of skill, name or email is required")
+    taxonomy = taxonomy_store.current
+    skills = resolve_skills(skill)
+    projection = resume_projection(fields)
+    after_id = None
+    if after:
+        try:
+            after_id = ObjectId(after)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    try:
+        if skills and not (name or email) and SKILL_INDEX_ENABLED and skill_index.ready:
+            # One extra id tells whether there is a next page
+            after_key = str(after_id) if after_id is not None else None
+            ids = skill_index.query(skills, after=after_key, limit=limit + 1)
+            page_ids = ids[:limit]
+            cursor = resumes.find(
+                {"_id": {"$in": [ObjectId(resume_id) for resume_id in page_ids]}}, projection
+            ).sort("_id", 1)
+            results = await cursor.to_list(length=limit)
+            found = {str(resume["_id"]) for resume in results}
+            skill_index.discard(resume_id for resume_id in page_ids if resume_id not in found)
+            more = len(ids) > limit
+        else:
+            query: Dict[str, Any] = {}
+            if skills:
+                # Current documents store skill ids; ones not migrated yet store names
+                skill_keys = taxonomy.encode_skills(skills)
+                if skill_keys == skills:
+                    query["skills"] = {"$all": skills}
+                else:
+                    query["$or"] = [{"skills": {"$all": skill_keys}}, {"skills": {"$all": skills}}]
+            if name:
+                query["$text"] = {"$search": name}
+            if email:
+                query["email"] = email
+            if after_id is not None:
+                query["_id"] = {"$gt": after_id}
+            cursor = resumes.find(query, projection).sort("_id", 1).limit(limit + 1)
+            results = await cursor.to_list(length=limit + 1)
+            more = len(results) > limit
+            results = results[:limit]
+    except Exception as e:
+        logger.error(f"Error searching resumes: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to search resumes")
+
+    results = [decode_resume(resume, taxonomy) for resume in results]
+    headers = {}
+    if more and results:
+        headers["X-Next-Cursor"] = results[-1]['_id']
+    return JSONResponse(content=jsonable_encoder(results), headers=headers)
+
+@app.get("/resumes/{resume_id}/similar")
+async def similar_resumes(
+    resume_id: str,
+    limit: int = Query(10, ge=1, le=RESUMES_MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return"),
+    resumes: AsyncIOMotorCollection = Depends(get_resumes_collection)
+):
+    """Resumes whose skills overlap most with this one's, most similar first.
+
+    Candidates come from the in-memory similarity index; each result has
+    a ``similarity`` score, the Jaccard similarity of the two skill sets.
+    """
+    if not (SIMILARITY_INDEX_ENABLED and similarity_index.ready):
+        raise HTTPException(status_code=503, detail="Similarity index is not ready. Please try again later.")
+    try:
+        object_id = ObjectId(resume_id)
+    except Exception:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    projection = resume_projection(fields)
+
+    try:
+        # Read the skills from Mongo; the resume may come from another worker
+        resume = await resumes.find_one({"_id": object_id}, {"skills": 1})
+        if not resume:
+            raise HTTPException(status_code=404, detail="Resume not found")
+        matches = similarity_index.query(resume.get("skills", []), limit, exclude=resume_id)
+        results = await resumes.find(
+            {"_id": {"$in": [ObjectId(match_id) for match_id, _ in matches]}}, projection
+        ).to_list(length=limit)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error finding similar resumes: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to find similar resumes")
+
+    found = {str(result["_id"]): result for result in results}
+    similarity_index.discard(match_id for match_id, _ in matches if match_id not in found)
+    taxonomy = taxonomy_store.current
+    similar = []
+    for match_id, score in matches:
+        if match_id in found:
+            similar.append(dict(decode_resume(found[match_id], taxonomy), similarity=round(score, 4)))
+    return JSONResponse(content=jsonable_encoder(similar))
 
 @app.get("/resumes/{resume_id}")
-async def get_resume(resume_id: str):
-    resume = await resumes.find_one({"_id": resume_id})
+async def get_resume(
+    resume_id: str,
+    resumes: AsyncIOMotorCollection = Depends(get_resumes_collection)
+):
+    try:
+        object_id = ObjectId(resume_id)
+    except Exception:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    resume = await resumes.find_one({"_id": object_id})
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
-    return Resume(**resume).dict()
-
-async def extract_resume_data(text: str):
-    """Extract resume data from text"""
-    if not text:
-        raise ValueError("No text content provided")
-
-    # Extract name
-    name = ""
-    name_patterns = [
-        r'([A-Z][a-z]+\s+[A-Z][a-z]+)',  # First Last
-        r'([A-Z][a-z]+\s+[A-Z][a-z]+\s+[A-Z][a-z]+)',  # First Middle Last
-    ]
-    for pattern in name_patterns:
-        match = re.search(pattern, text)
-        if match:
-            name = match.group(0)
-            break
-
-    # Extract email
-    email = re.search(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', text)
-    email = email.group(0) if email else ""
-
-    # Extract phone
-    phone_patterns = [
-        r'\+?[0-9]{10,15}',  # 10-15 digit numbers
-        r'\+?[0-9\s()-]+',  # With spaces and special characters
-    ]
-    phone = ""
-    for pattern in phone_patterns:
-        match = re.search(pattern, text)
-        if match:
-            phone = match.group(0)
-            break
-
-    # Extract skills
-    skills = set()  # Use set to prevent duplicates
-    
-    # First check exact matches
-    for skill in SKILLS:
-        if skill.lower() in text.lower():
-            skills.add(skill)
-    
-    # Then check partial matches, but only add if not already matched
-    for skill in SKILLS:
-        if skill not in skills:  # Only check partial if not already matched
-            if any(skill.lower() in word.lower() for word in text.split()):
-                skills.add(skill)
-    
-    # Convert set back to list
-    skills = list(skills)
+    return Resume(**decode_resume(resume, taxonomy_store.current)).dict()
 
-    # Extract experience using spaCy
-    experience = []
-    doc = nlp(text)
-    
-    # Find companies
-    companies = []
-    for ent in doc.ents:
-        if ent.label_ in ['ORG', 'ORGANIZATION']:
-            companies.append(ent.text)
-
-    # Find roles
-    roles = []
-    role_patterns = [
-        r'\b(software|senior|junior|lead|principal|chief|chief\s+technology\s+officer|cto|director|manager|engineer|developer|analyst|architect|consultant)\b',
-    ]
-    for pattern in role_patterns:
-        matches = re.finditer(pattern, text.lower())
-        for match in matches:
-            role = text[match.start():match.end()].strip()
-            if len(role) > 3:
-                roles.append(role)
-
-    # Find dates
-    durations = []
-    date_patterns = [
-        r'\b(\d{4}|january|february|march|april|may|june|july|august|september|october|november|december)\b',
-    ]
-    for pattern in date_patterns:
-        matches = re.finditer(pattern, text.lower())
-        for match in matches:
-            duration = text[match.start():match.end()].strip()
-            if len(duration) > 3:
-                durations.append(duration)
-
-    # Create experience entries
-    experiences = []
-    for i in range(min(len(companies), len(roles), len(durations))):
-        experiences.append({
-            "company": companies[i],
-            "role": roles[i],
-            "duration": durations[i],
-            "description": " ".join(text.split()[:50])  # First 50 words as description
-        })
-
-    # Validate required fields
-    if not name or not email:
-        raise ValueError("Missing required fields: name and email are required")
-    
-    return {
-        "name": name,
-        "email": email,
-        "phone": phone,
-        "skills": skills,
-        "experience": experiences,
-        "uploaded_at": datetime.now().isoformat()
-    }
-    
-    print("\n=== Extracted Data ===")
-    print(f"Name: {name}")
-    print(f"Email: {email}")
-    print(f"Phone: {phone}")
-    print(f"Skills: {skills}")
-    print(f"Experience: {experiences}")
-    print("=== End of Extracted Data ===")
-    
-    return {
-        "name": name,
-        "email": email,
-        "phone": phone,
-        "skills": list(skills),  # Convert set to list
-        "experience": experiences,
-        "uploaded_at": datetime.now().isoformat()
-    }
+async def extract_resume_data(pages: Union[str, List[str]], timings: Optional[StageTimings] = None):
+    """Extract resume data from text, given whole or as a list of pages"""
+    return await analyze_resume(pages, nlp_executor, taxonomy_store.current, timings)
 
 async def save_resume(data: dict):
     try:
-        # Validate required fields
-        if not all(key in data for key in ['name', 'email', 'phone', 'skills', 'uploaded_at']):
-            raise ValueError("Missing required fields in resume data")
-            
-        # Validate experience data structure
-        if 'experience' in data:
-            for exp in data['experience']:
-                if not all(key in exp for key in ['company', 'role', 'duration', 'description']):
-                    raise ValueError("Invalid experience data structure")
-                    
-        # Save to MongoDB
-        result = await resumes.insert_one(data)
+        validate_resume_data(data)
+
+        # Save to MongoDB in the compact stored form
+        result = await mongo.db.resumes.insert_one(encode_resume(data, taxonomy_store.current))
         logger.info(f"Resume saved with ID: {result.inserted_id}")
         return result  # Return the entire result object
+    except DuplicateKeyError:
+        raise
     except Exception as e:
         logger.error(f"Error saving resume: {str(e)}")
         raise ValueError(f"Failed to save resume: {str(e)}")
@@ -0,0 +1,177 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Request metrics
+download_counter = Counter(
+    'resume_downloads',
+    'Number of resume downloads',
+    ['status_code', 'method', 'path']
+)
+
+request_latency = Histogram(
+    'request_latency_seconds',
+    'Request latency in seconds',
+    ['method', 'path', 'status_code']
+)
+
+# Skill taxonomy metrics
+taxonomy_reload_seconds = Gauge(
+    'skill_taxonomy_reload_seconds',
+    'Time taken by the last skill taxonomy reload'
+)
+
+taxonomy_skills = Gauge(
+    'skill_taxonomy_skills',
+    'Number of canonical skills in the loaded taxonomy'
+)
+
+taxonomy_index_size = Gauge(
+    'skill_taxonomy_index_patterns',
+    'Number of skill and alias patterns in the compiled index'
+)
+
+# Upload deduplication metrics
+dedup_hits = Counter(
+    'resume_dedup_hits',
+    'Uploads matched to an existing resume by content hash',
+    ['layer']
+)
+
+dedup_misses = Counter(
+    'resume_dedup_misses',
+    'Uploads with a content hash not seen before'
+)
+
+# MongoDB connection pool metrics
+mongo_pool_max_size = Gauge(
+    'mongo_pool_max_size',
+    'Configured maximum connections per MongoDB server pool'
+)
+
+mongo_pool_open = Gauge(
+    'mongo_pool_open_connections',
+    'Open connections in the MongoDB pool'
+)
+
+mongo_pool_checked_out = Gauge(
+    'mongo_pool_checked_out_connections',
+    'MongoDB connections currently in use'
+)
+
+mongo_pool_checkout_failures = Counter(
+    'mongo_pool_checkout_failures',
+    'Failed MongoDB connection checkouts',
+    ['reason']
+)
+
+# Extraction pipeline metrics. Stages: sniff, pdf_open, page_text, fingerprint, fields,
+# skills, ner, mongo_write (mongo_bulk_write per batch chunk). Timings are
+# labelled with a coarse size class rather than the size itself so the
+# number of series stays fixed.
+
+stage_seconds = Histogram(
+    'resume_stage_seconds',
+    'Time spent in each resume extraction stage (page_text is per page)',
+    ['stage', 'size'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+
+document_bytes = Histogram(
+    'resume_document_bytes',
+    'Size of processed resume files in bytes',
+    buckets=(10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000, 10_000_000)
+)
+
+document_pages = Histogram(
+    'resume_document_pages',
+    'Pages read from processed resume files',
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100)
+)
+
+
+def size_class(num_bytes: int) -> str:
+    if num_bytes < 100_000:
+        return "small"
+    if num_bytes < 1_000_000:
+        return "medium"
+    return "large"
+
+
+class StageTimings:
+    """Durations of the extraction stages for one document.
+
+    Stages are timed with ``stage()`` or merged from a worker's plain dict
+    with ``merge()``, then published together by ``observe()`` once the
+    document size and page count are known.
+    """
+
+    def __init__(self):
+        self.seconds: Dict[str, List[float]] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start_time)
+
+    def add(self, name: str, seconds: float):
+        self.seconds.setdefault(name, []).append(seconds)
+
+    def merge(self, seconds: Dict[str, List[float]]):
+        for name, values in seconds.items():
+            self.seconds.setdefault(name, []).extend(values)
+
+    @property
+    def page_count(self) -> int:
+        return len(self.seconds.get("page_text", ()))
+
+    def totals(self) -> Dict[str, float]:
+        return {name: sum(values) for name, values in self.seconds.items()}
+
+    def observe(self, num_bytes: int, pages: int):
+        size = size_class(num_bytes)
+        for name, values in self.seconds.items():
+            histogram = stage_seconds.labels(stage=name, size=size)
+            for seconds in values:
+                histogram.observe(seconds)
+        document_bytes.observe(num_bytes)
+        document_pages.observe(pages)
+
+# Upload ingestion metrics
+upload_buffer_bytes = Gauge(
+    'upload_buffer_bytes',
+    'Bytes of uploads currently held in memory (spooled uploads excluded)'
+)
+
+# Extraction result cache metrics
+result_cache_hits = Counter(
+    'resume_result_cache_hits',
+    'Extractions skipped because the text fingerprint was cached',
+    ['layer']
+)
+
+result_cache_misses = Counter(
+    'resume_result_cache_misses',
+    'Extractions with a text fingerprint not in the cache'
+)
+
+result_cache_evictions = Counter(
+    'resume_result_cache_evictions',
+    'Entries removed from the in-memory result cache',
+    ['reason']
+)
+
+result_cache_entries = Gauge(
+    'resume_result_cache_entries',
+    'Entries in the in-memory result cache'
+)
+
+result_cache_bytes = Gauge(
+    'resume_result_cache_bytes',
+    'Bytes of results held in the in-memory result cache'
+)
@@ -0,0 +1,255 @@
+"""Pure ASGI middleware for the API.
+
+Unlike ``@app.middleware("http")`` functions, these layers never wrap the
+request and response in Starlette objects or run the endpoint in a
+separate task; they only look at the ASGI scope and patch the
+``http.response.start`` message on its way out.
+"""
+import logging
+import time
+from typing import AbstractSet, Dict, Iterable, List, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+from .metrics import download_counter, request_latency
+from .rate_limit import client_key
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+SECURITY_HEADERS = [
+    ("X-Content-Type-Options", "nosniff"),
+    ("X-Frame-Options", "DENY"),
+    ("X-XSS-Protection", "1; mode=block"),
+    ("Strict-Transport-Security", "max-age=31536000; includeSubDomains"),
+    ("Referrer-Policy", "strict-origin-when-cross-origin"),
+]
+
+
+def _encode_headers(headers: Iterable[Tuple[str, str]]) -> List[Tuple[bytes, bytes]]:
+    return [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+
+
+def _client_host(scope) -> Optional[str]:
+    client = scope.get("client")
+    return client[0] if client else None
+
+
+class SecurityHeadersMiddleware:
+    """Add the standard security headers to every HTTP response"""
+
+    def __init__(self, app, headers: Iterable[Tuple[str, str]] = SECURITY_HEADERS):
+        self.app = app
+        self.raw_headers = _encode_headers(headers)
+        self.names = {name for name, _ in self.raw_headers}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = [header for header in message.get("headers", []) if header[0] not in self.names]
+                message["headers"] = headers + self.raw_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class RateLimitMiddleware:
+    """Check GET and POST requests against a limiter from ``app.rate_limit``.
+
+    Rejected requests get a 429 without reaching the app. A limiter error
+    lets the request through, so a shared backend outage does not take the
+    API down.
+    """
+
+    def __init__(self, app, limiter, trust_proxy: bool = False,
+                 logger: Optional[logging.Logger] = None, api_keys: AbstractSet[str] = frozenset()):
+        self.app = app
+        self.limiter = limiter
+        self.trust_proxy = trust_proxy
+        self.api_keys = api_keys
+        self.logger = logger or logging.getLogger(__name__)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "POST"):
+            await self.app(scope, receive, send)
+            return
+        key = client_key(Headers(scope=scope), _client_host(scope), self.trust_proxy, self.api_keys)
+        try:
+            result = await self.limiter.hit(key)
+        except Exception as e:
+            self.logger.error(f"Rate limiter unavailable: {str(e)}")
+            await self.app(scope, receive, send)
+            return
+        if not result.allowed:
+            response = JSONResponse(
+                status_code=429,
+                content={"error": "Too many requests. Please try again later."},
+                headers={**result.headers(), "Retry-After": str(result.reset)}
+            )
+            await response(scope, receive, send)
+            return
+        raw_headers = _encode_headers(result.headers().items())
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + raw_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class RequestTooLarge(Exception):
+    """Raised from ``receive`` once a request body passes its limit"""
+
+
+class BodySizeLimitMiddleware:
+    """Reject request bodies over a per-path limit before they are buffered.
+
+    A declared Content-Length over the limit is refused without reading the
+    body. Otherwise the body is counted as it is received and the request
+    is cut off as soon as it passes the limit. Whatever response the app
+    produces from the aborted read is replaced with a 413.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+        declared = Headers(scope=scope).get("content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            await self._reject(scope, receive, send, limit)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    raise RequestTooLarge(f"Request body exceeds {limit} bytes")
+            return message
+
+        async def guarded_send(message):
+            nonlocal response_started
+            if exceeded and not response_started:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not exceeded:
+                raise
+        if exceeded and not response_started:
+            await self._reject(scope, receive, send, limit)
+
+    @staticmethod
+    async def _reject(scope, receive, send, limit: int):
+        response = JSONResponse(
+            status_code=413,
+            content={"error": f"Request body too large. Maximum size is {limit // (1024 * 1024)}MB"},
+            headers={"Connection": "close"}
+        )
+        await response(scope, receive, send)
+
+
+def route_template(scope) -> str:
+    """The path template of the route that handled the request.
+
+    The router records the matched route in the scope, so label values are
+    bounded by the number of routes rather than the number of ids seen.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Count requests and observe their latency in Prometheus, by route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            method, path, status = scope["method"], route_template(scope), str(status_code)
+            download_counter.labels(status_code=status, method=method, path=path).inc()
+            request_latency.labels(method=method, path=path, status_code=status).observe(
+                time.perf_counter() - start_time
+            )
+
+
+class AccessLogMiddleware:
+    """Write one structured access log record per request.
+
+    Server errors are logged at ERROR so they survive access log sampling.
+    """
+
+    def __init__(self, app, access_logger: logging.Logger):
+        self.app = app
+        self.access_logger = access_logger
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        error = None
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            level = logging.ERROR if status_code >= 500 else logging.INFO
+            if self.access_logger.isEnabledFor(level):
+                headers = Headers(scope=scope)
+                query = scope.get("query_string", b"").decode("latin-1")
+                fields = {
+                    "method": scope["method"],
+                    "path": scope["path"] + (f"?{query}" if query else ""),
+                    "status_code": status_code,
+                    "processing_time": time.perf_counter() - start_time,
+                    "client": _client_host(scope) or "unknown",
+                    "user_agent": headers.get("user-agent", "unknown"),
+                }
+                if error is not None:
+                    fields["error"] = error
+                self.access_logger.log(level, "request", extra={"fields": fields})
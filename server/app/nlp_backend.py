@@ -0,0 +1,71 @@
+import logging
+import os
+import threading
+import time
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Components that extract_resume_data never reads; the small English
+# pipelines give NER its own embedding layer, so tok2vec can go too.
+DEFAULT_EXCLUDE = "tok2vec,tagger,parser,attribute_ruler,lemmatizer,senter"
+
+WARM_UP_TEXT = "John Smith worked as a Software Engineer at Acme Corporation from 2018 to 2021."
+
+
+class NlpBackend:
+    """spaCy pipeline trimmed to named entity recognition, loaded on first use.
+
+    Configuration (environment variables):
+        SPACY_MODEL   - installed pipeline package (default en_core_web_sm)
+        SPACY_EXCLUDE - comma separated components not to load
+
+    The model must be installed ahead of time; it is never downloaded at
+    runtime.
+    """
+
+    def __init__(self, model: Optional[str] = None, exclude: Optional[List[str]] = None):
+        self.model = model or os.getenv("SPACY_MODEL", "en_core_web_sm")
+        if exclude is None:
+            exclude = [name.strip() for name in os.getenv("SPACY_EXCLUDE", DEFAULT_EXCLUDE).split(",")]
+        self.exclude = [name for name in exclude if name]
+        self._nlp = None
+        self._ready = False
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """True once the model is loaded and has processed a document"""
+        return self._ready
+
+    def get(self):
+        """Return the loaded pipeline, loading it if needed"""
+        if self._nlp is None:
+            with self._lock:
+                if self._nlp is None:
+                    self._nlp = self._load()
+        return self._nlp
+
+    def _load(self):
+        import spacy
+
+        start_time = time.perf_counter()
+        try:
+            nlp = spacy.load(self.model, exclude=self.exclude)
+        except OSError as e:
+            raise RuntimeError(
+                f"spaCy model '{self.model}' is not installed; "
+                f"install it with: python -m spacy download {self.model}"
+            ) from e
+        logger.info(
+            f"Spacy model {self.model} loaded in {time.perf_counter() - start_time:.2f}s "
+            f"with components {nlp.pipe_names}"
+        )
+        return nlp
+
+    def warm_up(self):
+        """Load the model and run one document through it"""
+        start_time = time.perf_counter()
+        self.get()(WARM_UP_TEXT)
+        self._ready = True
+        logger.info(f"Spacy model warmed up in {time.perf_counter() - start_time:.2f}s")
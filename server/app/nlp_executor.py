@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+
+from .nlp_backend import NlpBackend
+
+logger = logging.getLogger(__name__)
+
+ORG_LABELS = ("ORG", "ORGANIZATION")
+
+# Backend inherited by forked pool workers. It is loaded in the parent
+# before the pool starts, so workers share the model pages copy-on-write
+# instead of each loading their own copy.
+_fork_backend: Optional[NlpBackend] = None
+
+
+class NlpBusy(Exception):
+    """Raised when the NLP submission queue is full"""
+
+
+class NlpTimeout(Exception):
+    """Raised when a document takes longer than the per-document timeout"""
+
+
+def find_organizations(nlp, texts: List[str], batch_size: int) -> List[List[str]]:
+    """Organization names found in each text by a loaded spaCy pipeline"""
+    return [
+        [ent.text for ent in doc.ents if ent.label_ in ORG_LABELS]
+        for doc in nlp.pipe(texts, batch_size=batch_size)
+    ]
+
+
+def _organizations(texts: List[str], batch_size: int, backend: Optional[NlpBackend] = None) -> List[List[str]]:
+    """Organization names found in each text (runs inside the pool)"""
+    return find_organizations((backend or _fork_backend).get(), texts, batch_size)
+
+
+class NlpExecutor:
+    """Runs spaCy NER off the event loop.
+
+    Configuration (environment variables):
+        NLP_MODE        - "inline" (on the event loop), "thread" (default)
+                          or "process" (forked workers sharing the model)
+        NLP_WORKERS     - threads or processes (default 1 for thread mode,
+                          the CPU count for process mode)
+        NLP_QUEUE_DEPTH - documents waiting for a worker before new ones are
+                          rejected (default 4x the workers)
+        NLP_TIMEOUT     - seconds allowed per document (default 30, 0 = none)
+
+    Only entity texts come back from the workers, so nothing but strings
+    crosses the process boundary. A timed-out document stops being waited
+    for, but the worker running it finishes it before taking the next one.
+    """
+
+    def __init__(self, backend: NlpBackend, mode: Optional[str] = None,
+                 workers: Optional[int] = None, queue_depth: Optional[int] = None,
+                 timeout: Optional[float] = None, batch_size: int = 32):
+        self.backend = backend
+        self.mode = (mode or os.getenv("NLP_MODE", "thread")).lower()
+        if self.mode not in ("inline", "thread", "process"):
+            raise ValueError(f"Unknown NLP_MODE: {self.mode}")
+        default_workers = (os.cpu_count() or 1) if self.mode == "process" else 1
+        self.workers = workers or int(os.getenv("NLP_WORKERS", default_workers))
+        if queue_depth is None:
+            queue_depth = int(os.getenv("NLP_QUEUE_DEPTH", self.workers * 4))
+        self.queue_depth = queue_depth
+        if timeout is None:
+            timeout = float(os.getenv("NLP_TIMEOUT", "30"))
+        self.timeout = timeout or None
+        self.batch_size = batch_size
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+
+    async def start(self):
+        """Create the pool; in process mode the model is loaded first, then forked"""
+        if self._slots is not None:
+            return
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._slots is not None:
+                return
+            if self.mode == "process":
+                global _fork_backend
+                await asyncio.to_thread(self.backend.get)
+                _fork_backend = self.backend
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("fork")
+                )
+            elif self.mode == "thread":
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="nlp")
+            self._slots = asyncio.Semaphore(self.workers + self.queue_depth)
+            logger.info(
+                f"NLP executor started ({self.mode}, {self.workers} workers, "
+                f"queue depth {self.queue_depth})"
+            )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._slots = None
+
+    async def organizations(self, text: str, wait: bool = False) -> List[str]:
+        """Organization entities in one document"""
+        return (await self.organizations_many([text], wait=wait))[0]
+
+    async def organizations_many(self, texts: List[str], wait: bool = False) -> List[List[str]]:
+        """Organization entities for each document, spread over the workers.
+
+        When the queue is full, raises NlpBusy unless ``wait`` is set (used
+        by batch uploads). Raises NlpTimeout if a share of the documents
+        takes longer than the per-document timeout allows.
+        """
+        if not texts:
+            return []
+        await self.start()
+        if self.mode == "inline":
+            return _organizations(texts, self.batch_size, self.backend)
+
+        # One share per worker, each run through nlp.pipe
+        share = math.ceil(len(texts) / self.workers)
+        shares = [texts[start:start + share] for start in range(0, len(texts), share)]
+        results = await asyncio.gather(*(self._submit(part, wait) for part in shares))
+        return [entities for part in results for entities in part]
+
+    async def _submit(self, texts: List[str], wait: bool) -> List[List[str]]:
+        if not wait and self._slots.locked():
+            raise NlpBusy("NLP queue is full")
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            backend = None if self.mode == "process" else self.backend
+            future = loop.run_in_executor(self._executor, _organizations, texts, self.batch_size, backend)
+            timeout = self.timeout * len(texts) if self.timeout else None
+            try:
+                return await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                raise NlpTimeout(f"NER did not finish {len(texts)} document(s) within {timeout:.0f}s")
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .metrics import StageTimings
+
+logger = logging.getLogger(__name__)
+
+
+class PdfEngineBusy(Exception):
+    """Raised when the extraction queue is full"""
+
+
+def iter_page_text(pdf_document, max_pages: Optional[int] = None) -> Iterator[str]:
+    """Yield the text of each page, stopping after max_pages"""
+    for number, page in enumerate(pdf_document):
+        if max_pages is not None and number >= max_pages:
+            break
+        yield page.get_text()
+
+
+PdfSource = Union[bytes, bytearray, str]
+
+
+def open_pdf(source: PdfSource):
+    """Open a PDF from an in-memory buffer or a file path"""
+    import fitz  # PyMuPDF, imported on first use
+
+    if isinstance(source, str):
+        return fitz.open(source, filetype="pdf")
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def _extract_pages(source: PdfSource, max_pages: Optional[int]) -> Tuple[List[str], Dict[str, List[float]]]:
+    """Extract page texts from a PDF buffer or file (runs inside the pool).
+
+    Also returns the time spent opening the document and on each page, as a
+    plain dict so it can come back from a worker process.
+    """
+    start_time = time.perf_counter()
+    with open_pdf(source) as pdf_document:
+        timings = {"pdf_open": [time.perf_counter() - start_time], "page_text": []}
+        pages = []
+        start_time = time.perf_counter()
+        for text in iter_page_text(pdf_document, max_pages):
+            now = time.perf_counter()
+            timings["page_text"].append(now - start_time)
+            start_time = now
+            pages.append(text)
+        return pages, timings
+
+
+class PdfExtractionEngine:
+    """Bounded worker pool that extracts text from PDF byte buffers.
+
+    Configuration (environment variables):
+        PDF_POOL_MODE   - "process" (default) or "thread"; PyMuPDF is not
+                          thread-safe and holds the GIL, so thread mode
+                          always runs a single worker
+        PDF_POOL_SIZE   - number of worker processes, defaults to the CPU
+                          count
+        PDF_QUEUE_DEPTH - max jobs waiting for a worker before new requests
+                          are rejected, defaults to 4x the pool size
+        PDF_PAGE_CAP    - pages read per document (default 50, 0 = no cap);
+                          later pages of long portfolios are never parsed
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        queue_depth: Optional[int] = None,
+        mode: Optional[str] = None,
+        page_cap: Optional[int] = None,
+    ):
+        self.mode = (mode or os.getenv("PDF_POOL_MODE", "process")).lower()
+        if self.mode not in ("thread", "process"):
+            raise ValueError(f"Unknown PDF_POOL_MODE: {self.mode}")
+        self.pool_size = pool_size or int(os.getenv("PDF_POOL_SIZE", os.cpu_count() or 1))
+        if self.mode == "thread" and self.pool_size > 1:
+            logger.warning("PDF_POOL_MODE=thread runs a single worker; PyMuPDF is not thread-safe")
+            self.pool_size = 1
+        if queue_depth is None:
+            queue_depth = int(os.getenv("PDF_QUEUE_DEPTH", self.pool_size * 4))
+        self.queue_depth = queue_depth
+        if page_cap is None:
+            page_cap = int(os.getenv("PDF_PAGE_CAP", "50"))
+        self.page_cap = page_cap or None
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def start(self):
+        if self._executor is not None:
+            return
+        if self.mode == "process":
+            # Spawned, not forked: the server process already runs threads
+            # (log writer, executors) whose locks a fork could copy held
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.pool_size, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.pool_size, thread_name_prefix="pdf-extract"
+            )
+        # Workers plus waiting jobs; anything beyond is rejected immediately
+        self._slots = asyncio.Semaphore(self.pool_size + self.queue_depth)
+        logger.info(
+            f"PDF extraction engine started ({self.mode}, "
+            f"{self.pool_size} workers, queue depth {self.queue_depth})"
+        )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            self._slots = None
+            logger.info("PDF extraction engine stopped")
+
+    async def extract_pages(self, source: PdfSource, wait: bool = False,
+                            timings: Optional[StageTimings] = None) -> List[str]:
+        """Extract the text of each page (up to the page cap) on the worker pool.
+
+        ``source`` is the PDF bytes or the path of a file holding them;
+        passing a path keeps large uploads out of process pool pickling.
+
+        When the queue is full, raises PdfEngineBusy unless ``wait`` is set,
+        in which case the caller waits for a free slot (used by batch jobs).
+        The worker's stage timings are added to ``timings`` when given.
+        """
+        if self._executor is None:
+            self.start()
+        if not wait and self._slots.locked():
+            raise PdfEngineBusy("PDF extraction queue is full")
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            pages, worker_timings = await loop.run_in_executor(
+                self._executor, _extract_pages, source, self.page_cap
+            )
+        if timings is not None:
+            timings.merge(worker_timings)
+        return pages
+
+
+pdf_engine = PdfExtractionEngine()
@@ -0,0 +1,127 @@
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import AbstractSet, NamedTuple, Optional, Tuple
+
+from pymongo import ReturnDocument
+
+from .cache import LRUCache
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: int  # seconds until the limit is fully restored
+
+    def headers(self) -> dict:
+        return {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(self.reset),
+        }
+
+
+class TokenBucketLimiter:
+    """In-process token bucket per key.
+
+    Each key holds ``limit`` tokens refilled continuously over ``window``
+    seconds. Buckets live in an LRU map bounded by ``max_keys`` so memory
+    stays flat however many clients are seen; a bucket evicted while idle
+    would have refilled anyway.
+    """
+
+    def __init__(self, limit: int, window: float, max_keys: int = 100000):
+        self.limit = limit
+        self.window = window
+        self.rate = limit / window
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def hit(self, key: str) -> RateLimitResult:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (self.limit, now))
+        tokens = min(self.limit, tokens + (now - updated) * self.rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        reset = math.ceil((self.limit - tokens) / self.rate)
+        return RateLimitResult(allowed, self.limit, int(tokens), reset)
+
+
+class MongoWindowLimiter:
+    """Sliding window counter shared by every worker through Mongo.
+
+    Requests are counted per key in fixed windows stored in a TTL
+    collection; the current estimate weights the previous window by how
+    much of it still overlaps the sliding window. Each request costs one
+    atomic find_one_and_update; the previous window's final count is
+    cached locally because it no longer changes.
+
+    The collection may be assigned after construction, once the database
+    client is connected.
+    """
+
+    def __init__(self, limit: int, window: int, collection=None, max_keys: int = 100000):
+        self.collection = collection
+        self.limit = limit
+        self.window = window
+        self._previous = LRUCache(max_keys)
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def _previous_count(self, key: str, window_start: int) -> int:
+        cached = self._previous.get(key)
+        if cached is not None and cached[0] == window_start:
+            return cached[1]
+        doc = await self.collection.find_one({"_id": f"{key}:{window_start}"}, {"count": 1})
+        count = doc["count"] if doc else 0
+        self._previous.set(key, (window_start, count))
+        return count
+
+    async def hit(self, key: str) -> RateLimitResult:
+        now = time.time()
+        window_start = int(now // self.window) * self.window
+        doc = await self.collection.find_one_and_update(
+            {"_id": f"{key}:{window_start}"},
+            {
+                "$inc": {"count": 1},
+                "$setOnInsert": {"expires_at": _expiry(window_start + 2 * self.window)},
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        previous = await self._previous_count(key, window_start - self.window)
+        elapsed = (now - window_start) / self.window
+        used = doc["count"] + previous * (1 - elapsed)
+        allowed = used <= self.limit
+        remaining = max(0, int(self.limit - used))
+        reset = math.ceil(window_start + self.window - now)
+        return RateLimitResult(allowed, self.limit, remaining, reset)
+
+
+def _expiry(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def client_key(headers, client_host: Optional[str], trust_proxy: bool,
+               api_keys: AbstractSet[str] = frozenset()) -> str:
+    """Rate limit key: a known API key when one is sent, otherwise the client IP.
+
+    Unknown keys fall back to the IP, so clients cannot get a fresh bucket
+    by sending a new key with each request. Keys are stored hashed.
+    """
+    api_key = headers.get("x-api-key")
+    if api_key and api_key in api_keys:
+        return f"key:{hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:32]}"
+    if trust_proxy:
+        forwarded = headers.get("x-forwarded-for")
+        if forwarded:
+            return f"ip:{forwarded.split(',')[0].strip()}"
+    return f"ip:{client_host or 'unknown'}"
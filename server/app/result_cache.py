@@ -0,0 +1,121 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from .cache import LRUCache
+from .metrics import (result_cache_bytes, result_cache_entries, result_cache_evictions,
+                      result_cache_hits, result_cache_misses)
+
+logger = logging.getLogger(__name__)
+
+# Bump when a change to extraction would produce different results for
+# the same text, so entries written by older code are no longer used
+EXTRACTION_VERSION = 2
+
+
+def text_fingerprint(pages: List[str], taxonomy_version: str) -> str:
+    """Key for extraction results of a document's text.
+
+    PDFs that differ only in metadata or producer extract to the same page
+    texts and so share a key. The text is hashed as extracted, page by
+    page: the field patterns depend on case, newlines and runs of spaces,
+    and contact details are looked for page by page, so any normalization
+    could give two texts with different results the same key. The
+    taxonomy version is part of the key since it decides which skills
+    are found.
+    """
+    digest = hashlib.sha256(f"{EXTRACTION_VERSION}\0{taxonomy_version}\0".encode())
+    for page in pages:
+        # Length-prefixed so page boundaries are part of the key
+        data = page.encode("utf-8", "surrogatepass")
+        digest.update(f"{len(data)}\0".encode())
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Extraction results by text fingerprint, in memory and optionally in Mongo.
+
+    Configuration (environment variables):
+        RESULT_CACHE_SIZE      - entries kept in memory (default 10000, 0 = off)
+        RESULT_CACHE_MAX_BYTES - memory budget for cached results
+                                 (default 64 MB)
+        RESULT_CACHE_TTL       - seconds an entry is reused (default 86400)
+        RESULT_CACHE_STORE     - "memory" (default) or "mongo" to also keep
+                                 entries in a collection shared by every
+                                 worker and kept across restarts
+
+    Results are held as JSON so callers always get their own copy and the
+    memory budget counts real bytes. The collection may be assigned after
+    construction, once the database client is connected.
+    """
+
+    def __init__(self, collection=None):
+        self.max_entries = int(os.getenv("RESULT_CACHE_SIZE", "10000"))
+        self.ttl = int(os.getenv("RESULT_CACHE_TTL", "86400"))
+        self.persistent = os.getenv("RESULT_CACHE_STORE", "memory").lower() == "mongo"
+        self.collection = collection
+        self._memory = LRUCache(
+            self.max_entries,
+            ttl=self.ttl,
+            max_bytes=int(os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+            sizeof=len,
+            on_evict=lambda reason: result_cache_evictions.labels(reason=reason).inc(),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    def _update_gauges(self):
+        result_cache_entries.set(len(self._memory))
+        result_cache_bytes.set(self._memory.size)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        encoded = self._memory.get(key)
+        if encoded is not None:
+            result_cache_hits.labels(layer="memory").inc()
+            return json.loads(encoded)
+        if self.persistent and self.collection is not None:
+            try:
+                stored = await self.collection.find_one(
+                    {"_id": key, "expires_at": {"$gt": datetime.utcnow()}}, {"result": 1}
+                )
+            except Exception as e:
+                logger.error(f"Error reading result cache: {str(e)}")
+                stored = None
+            if stored is not None:
+                result_cache_hits.labels(layer="database").inc()
+                self._memory.set(key, stored["result"])
+                self._update_gauges()
+                return json.loads(stored["result"])
+        result_cache_misses.inc()
+        self._update_gauges()
+        return None
+
+    async def set(self, key: str, result: Dict[str, Any]):
+        if not self.enabled:
+            return
+        encoded = json.dumps(result, separators=(",", ":"), default=str)
+        self._memory.set(key, encoded)
+        self._update_gauges()
+        if self.persistent and self.collection is not None:
+            try:
+                await self.collection.update_one(
+                    {"_id": key},
+                    {"$set": {
+                        "result": encoded,
+                        "expires_at": datetime.utcnow() + timedelta(seconds=self.ttl),
+                    }},
+                    upsert=True,
+                )
+            except Exception as e:
+                logger.error(f"Error writing result cache: {str(e)}")
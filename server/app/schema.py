@@ -0,0 +1,198 @@
+"""Stored resume schema and migration of older documents.
+
+Version 2 documents are compact: skills are taxonomy ids, the description
+shared by every experience entry is stored once as ``summary``,
+``uploaded_at`` is a datetime and ``search`` holds the lowercased text
+behind name search. ``decode_resume`` turns any stored version back into
+the shape the API returns, so documents can be migrated while serving.
+
+Migrate existing documents with:
+
+    python -m app.schema [--batch-size 500] [--dry-run]
+"""
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+from pymongo import ReplaceOne
+
+from .database import MongoManager
+from .taxonomy import SkillTaxonomy, TaxonomyStore
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2
+
+# Documents written before versioning have no "v"
+LEGACY_VERSION = 1
+
+SEARCH_INDEX = "resume_search"
+LEGACY_TEXT_INDEX = "resume_text"
+
+# Stored fields that never leave the server
+INTERNAL_FIELDS = ("v", "search", "summary", "content_hash")
+
+
+def search_text(data: Dict[str, Any]) -> str:
+    """Lowercased name, email, companies and roles of a resume"""
+    parts = [data.get("name", ""), data.get("email", "")]
+    for entry in data.get("experience", []):
+        parts += [entry.get("company", ""), entry.get("role", "")]
+    return " ".join(dict.fromkeys(part.lower() for part in parts if part))
+
+
+def encode_resume(data: Dict[str, Any], taxonomy: SkillTaxonomy) -> Dict[str, Any]:
+    """Stored document for resume data as produced by extraction"""
+    document = dict(data)
+    document["v"] = SCHEMA_VERSION
+    document["skills"] = taxonomy.encode_skills(data.get("skills", []))
+    document["experience"] = [
+        {"company": entry.get("company", ""), "role": entry.get("role", ""), "duration": entry.get("duration", "")}
+        for entry in data.get("experience", [])
+    ]
+    document["summary"] = data.get("summary", "")
+    document["search"] = search_text(data)
+    return document
+
+
+def decode_resume(document: Dict[str, Any], taxonomy: SkillTaxonomy) -> Dict[str, Any]:
+    """API representation of a stored document of any version.
+
+    Works on projected documents too, as long as "v" (and "summary" for
+    experience) was part of the projection.
+    """
+    resume = {key: value for key, value in document.items() if key not in INTERNAL_FIELDS}
+    if "_id" in resume:
+        resume["_id"] = str(resume["_id"])
+    if document.get("v", LEGACY_VERSION) >= 2:
+        if "skills" in document:
+            resume["skills"] = taxonomy.decode_skills(document["skills"])
+        if "experience" in document:
+            summary = document.get("summary", "")
+            resume["experience"] = [dict(entry, description=summary) for entry in document["experience"]]
+    if isinstance(resume.get("uploaded_at"), datetime):
+        resume["uploaded_at"] = resume["uploaded_at"].isoformat()
+    return resume
+
+
+def stored_projection(fields: List[str]) -> Dict[str, int]:
+    """Mongo projection for the given API fields, including what decoding needs"""
+    projection = {field: 1 for field in fields}
+    projection["v"] = 1
+    if "experience" in projection:
+        projection["summary"] = 1
+    return projection
+
+
+def upgrade_document(document: Dict[str, Any], taxonomy: SkillTaxonomy) -> Optional[Dict[str, Any]]:
+    """The current-version form of a stored document, or None if it is current"""
+    if document.get("v", LEGACY_VERSION) >= SCHEMA_VERSION:
+        return None
+    data = dict(document)
+    experience = data.get("experience", [])
+    # Version 1 copied the same description into every entry
+    data["summary"] = experience[0].get("description", "") if experience else ""
+    if isinstance(data.get("uploaded_at"), str):
+        try:
+            data["uploaded_at"] = datetime.fromisoformat(data["uploaded_at"])
+        except ValueError:
+            pass
+    return encode_resume(data, taxonomy)
+
+
+async def ensure_search_index(collection):
+    """Create the text index on ``search`` unless the legacy one is still in use.
+
+    A collection has at most one text index. Until migration replaces it,
+    the legacy index over name and experience keeps serving name search,
+    since migrated documents still carry those fields.
+    """
+    indexes = await collection.index_information()
+    if LEGACY_TEXT_INDEX in indexes:
+        logger.warning("Resumes are not fully migrated to the current schema; run python -m app.schema")
+        return
+    await collection.create_index([("search", "text")], name=SEARCH_INDEX)
+
+
+async def ensure_resume_indexes(collection):
+    """Indexes every writer of the resumes collection relies on"""
+    # Unique content hash index used to detect re-uploads
+    await collection.create_index(
+        "content_hash",
+        unique=True,
+        partialFilterExpression={"content_hash": {"$exists": True}}
+    )
+
+    # Indexes backing /resumes/search
+    await collection.create_index("skills")
+    await collection.create_index("email")
+    await ensure_search_index(collection)
+
+
+async def migrate_collection(collection, taxonomy: SkillTaxonomy, batch_size: int = 500,
+                             dry_run: bool = False) -> Dict[str, int]:
+    """Rewrite documents older than SCHEMA_VERSION in bulk, then switch text indexes.
+
+    Each replacement only applies if the document still has the version it
+    was read with, so documents changed or migrated concurrently are left
+    alone. Safe to run again after an interruption.
+    """
+    counts = {"scanned": 0, "migrated": 0}
+    operations = []
+
+    async def flush():
+        if operations and not dry_run:
+            result = await collection.bulk_write(operations, ordered=False)
+            counts["migrated"] += result.modified_count
+        elif dry_run:
+            counts["migrated"] += len(operations)
+        operations.clear()
+
+    cursor = collection.find({"v": {"$not": {"$gte": SCHEMA_VERSION}}}).sort("_id", 1).batch_size(batch_size)
+    async for document in cursor:
+        counts["scanned"] += 1
+        upgraded = upgrade_document(document, taxonomy)
+        if upgraded is None:
+            continue
+        operations.append(ReplaceOne({"_id": document["_id"], "v": document.get("v")}, upgraded))
+        if len(operations) >= batch_size:
+            await flush()
+    await flush()
+
+    if not dry_run:
+        indexes = await collection.index_information()
+        if LEGACY_TEXT_INDEX in indexes:
+            await collection.drop_index(LEGACY_TEXT_INDEX)
+        await ensure_search_index(collection)
+    return counts
+
+
+async def run_migration(args):
+    mongo = MongoManager()
+    await mongo.connect()
+    try:
+        taxonomy_store = TaxonomyStore(collection=mongo.db.skills)
+        taxonomy = await taxonomy_store.reload()
+        start_time = time.perf_counter()
+        counts = await migrate_collection(mongo.db.resumes, taxonomy, args.batch_size, args.dry_run)
+        verb = "Would migrate" if args.dry_run else "Migrated"
+        print(f"{verb} {counts['migrated']} of {counts['scanned']} resumes scanned "
+              f"to schema v{SCHEMA_VERSION} in {time.perf_counter() - start_time:.1f}s")
+    finally:
+        mongo.close()
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Migrate stored resumes to the current schema")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="count documents without writing")
+    asyncio.run(run_migration(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import asyncio
+import bisect
+import functools
+import gc
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+from bson import ObjectId
+
+logger = logging.getLogger(__name__)
+
+# ObjectIds from different workers created within the same moment are not
+# ordered, so each refresh re-reads a small window before the high-water mark
+REFRESH_OVERLAP = timedelta(seconds=5)
+
+# Resumes added per thread hand-off while loading from Mongo
+LOAD_BATCH_SIZE = 1000
+
+
+def locked(method):
+    """Run an index method under the index lock.
+
+    Loading from Mongo adds resumes on a worker thread while requests
+    query and update the index on the event loop.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class ResumeIndex(ABC):
+    """Base for in-memory indexes over the skills of stored resumes.
+
+    Built from the resumes collection on startup and kept current by this
+    worker's inserts and deletes. Resumes written by other workers are
+    picked up by ``refresh``, which reads only documents newer than the
+    last one read from Mongo. Resumes this worker adds itself do not move
+    that mark: an earlier insert by another worker could still be unread.
+    Deletes made elsewhere are not seen until the caller
+    reports them through ``discard`` (e.g. when a looked-up id no longer
+    exists), so results should always be re-read from Mongo.
+
+    Subclasses implement ``add`` and ``discard``, and extend ``clear`` and
+    ``describe`` for their own state. ``add`` must accept a resume that
+    is already indexed. Methods that read or change the index are
+    decorated with ``locked``: resumes loaded from Mongo are added on a
+    worker thread, a lock hold per resume, so building a large index
+    does not stall the event loop.
+    """
+
+    name = "Resume index"
+
+    def __init__(self):
+        self._high_water: Optional[ObjectId] = None
+        self._lock = threading.RLock()
+        self.ready = False
+
+    @abstractmethod
+    def add(self, resume_id: str, skills: Iterable[Any]):
+        """Index a resume"""
+
+    @abstractmethod
+    def discard(self, resume_ids: Iterable[str]):
+        """Forget ids that turned out to be deleted"""
+
+    def clear(self):
+        self._high_water = None
+
+    def describe(self) -> str:
+        return ""
+
+    def _add_loaded(self, resumes: List[dict]):
+        for resume in resumes:
+            self.add(str(resume["_id"]), resume.get("skills", []))
+        # Only resumes read from Mongo move the refresh mark
+        newest = max(resume["_id"] for resume in resumes)
+        if self._high_water is None or newest > self._high_water:
+            self._high_water = newest
+        # The index lives as long as the worker. Without this, the growing
+        # number of tracked objects triggers full collections that pause
+        # every thread, the event loop included, for a second or more.
+        gc.freeze()
+
+    async def _load(self, collection, query: dict) -> int:
+        count = 0
+        batch: List[dict] = []
+        # In _id order, so postings are appended rather than inserted
+        cursor = collection.find(query, {"skills": 1}).sort("_id", 1).batch_size(LOAD_BATCH_SIZE)
+        async for resume in cursor:
+            batch.append(resume)
+            if len(batch) >= LOAD_BATCH_SIZE:
+                await asyncio.to_thread(self._add_loaded, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            await asyncio.to_thread(self._add_loaded, batch)
+            count += len(batch)
+        return count
+
+    async def build(self, collection):
+        start_time = time.perf_counter()
+        self.clear()
+        count = await self._load(collection, {})
+        self.ready = True
+        logger.info(
+            f"{self.name} built: {count} resumes, {self.describe()} "
+            f"in {time.perf_counter() - start_time:.2f}s"
+        )
+
+    async def refresh(self, collection):
+        """Add resumes inserted since the last build or refresh"""
+        query = {}
+        if self._high_water is not None:
+            since = self._high_water.generation_time - REFRESH_OVERLAP
+            query = {"_id": {"$gt": ObjectId.from_datetime(since)}}
+        await self._load(collection, query)
+
+    async def watch(self, collection, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh(collection)
+            except Exception as e:
+                logger.error(f"{self.name} refresh failed: {str(e)}")
+
+
+def _insert_sorted(postings: List[str], resume_id: str):
+    # New resumes have the largest ids, so this is usually an append
+    if not postings or resume_id > postings[-1]:
+        postings.append(resume_id)
+        return
+    index = bisect.bisect_left(postings, resume_id)
+    if index == len(postings) or postings[index] != resume_id:
+        postings.insert(index, resume_id)
+
+
+def _remove_sorted(postings: List[str], resume_id: str):
+    index = bisect.bisect_left(postings, resume_id)
+    if index < len(postings) and postings[index] == resume_id:
+        del postings[index]
+
+
+def _contains_sorted(postings: List[str], resume_id: str) -> bool:
+    index = bisect.bisect_left(postings, resume_id)
+    return index < len(postings) and postings[index] == resume_id
+
+
+class SkillIndex(ResumeIndex):
+    """In-memory inverted index of skill -> resume ids.
+
+    ``key`` maps a skill, as stored or as queried, to its posting key, so
+    resumes storing a skill by name and by taxonomy id share one list.
+    Postings are kept sorted, like the ObjectIds (fixed-width hex strings
+    sort the same way), so a page of results needs no sorting.
+    """
+
+    name = "Skill index"
+
+    def __init__(self, key: Optional[Callable[[Any], Hashable]] = None):
+        super().__init__()
+        self.key = key or (lambda skill: skill)
+        self._postings: Dict[Hashable, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    @locked
+    def add(self, resume_id: str, skills: Iterable[Any]):
+        for skill in skills:
+            _insert_sorted(self._postings.setdefault(self.key(skill), []), resume_id)
+
+    @locked
+    def remove(self, resume_id: str, skills: Iterable[Any]):
+        for skill in skills:
+            key = self.key(skill)
+            postings = self._postings.get(key)
+            if postings is not None:
+                _remove_sorted(postings, resume_id)
+                if not postings:
+                    del self._postings[key]
+
+    @locked
+    def discard(self, resume_ids: Iterable[str]):
+        """Forget ids that turned out to be deleted"""
+        stale = set(resume_ids)
+        if not stale:
+            return
+        for skill in list(self._postings):
+            postings = self._postings[skill]
+            for resume_id in stale:
+                _remove_sorted(postings, resume_id)
+            if not postings:
+                del self._postings[skill]
+
+    @locked
+    def query(self, skills: List[Any], after: Optional[str] = None,
+              limit: Optional[int] = None) -> List[str]:
+        """Ids of resumes having every skill, in ObjectId order.
+
+        Only ids greater than ``after`` are returned, at most ``limit`` of
+        them. The shortest posting list is walked from ``after`` and each
+        id is looked up in the others, so the cost depends on the page
+        and not on how many resumes match.
+        """
+        postings = [self._postings.get(self.key(skill), []) for skill in skills]
+        if not postings:
+            return []
+        postings.sort(key=len)
+        first, others = postings[0], postings[1:]
+        start = bisect.bisect_right(first, after) if after is not None else 0
+        result: List[str] = []
+        for index in range(start, len(first)):
+            resume_id = first[index]
+            if all(_contains_sorted(other, resume_id) for other in others):
+                result.append(resume_id)
+                if limit is not None and len(result) >= limit:
+                    break
+        return result
+
+    @locked
+    def clear(self):
+        super().clear()
+        self._postings = {}
+
+    def describe(self) -> str:
+        return f"{len(self._postings)} skills"
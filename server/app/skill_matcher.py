@@ -0,0 +1,87 @@
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Tokens keep the characters that are significant in skill names
+# ("c++", "c#", "node.js") and split on everything else ("ci/cd" -> ci, cd).
+TOKEN_RE = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9+#]+)*")
+
+_TERMINAL = "\0"
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text into skill tokens"""
+    return TOKEN_RE.findall(text.lower())
+
+
+class SkillMatcher:
+    """Token trie that finds skills (and their aliases) in a single scan.
+
+    Matches respect token boundaries, so "Java" does not match inside
+    "JavaScript", and multi-word skills ("amazon web services") are
+    matched as one phrase. The trie is built once and is read-only
+    afterwards, so a matcher can be shared between threads.
+    """
+
+    def __init__(self, skills: Iterable[str], aliases: Optional[Dict[str, str]] = None):
+        self._root: Dict[str, dict] = {}
+        self.skills: List[str] = []
+        self.max_depth = 0
+        self.pattern_count = 0
+        for skill in skills:
+            self.skills.append(skill)
+            self._add(skill, skill)
+        for alias, skill in (aliases or {}).items():
+            self._add(alias, skill)
+
+    def _add(self, phrase: str, skill: str):
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if _TERMINAL not in node:
+            self.pattern_count += 1
+        node[_TERMINAL] = skill
+        self.max_depth = max(self.max_depth, len(tokens))
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def scan(self, tokens: List[str]) -> List[Tuple[str, int, int]]:
+        """Return (skill, first token, last token + 1) for the longest match at each position"""
+        matches = []
+        root = self._root
+        i, n = 0, len(tokens)
+        while i < n:
+            node = root.get(tokens[i])
+            if node is None:
+                i += 1
+                continue
+            best: Optional[Tuple[str, int]] = None
+            j = i + 1
+            while True:
+                if _TERMINAL in node:
+                    best = (node[_TERMINAL], j)
+                if j >= n:
+                    break
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+            if best is None:
+                i += 1
+                continue
+            matches.append((best[0], i, best[1]))
+            i = best[1]
+        return matches
+
+    def match(self, text: str) -> List[str]:
+        """Return the distinct skills mentioned in text, in order of first mention"""
+        seen: Set[str] = set()
+        found = []
+        for skill, _, _ in self.scan(tokenize(text)):
+            if skill not in seen:
+                seen.add(skill)
+                found.append(skill)
+        return found
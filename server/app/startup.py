@@ -0,0 +1,102 @@
+"""Worker startup: timing report and preloading shared state before fork.
+
+Run ``python -m app.startup`` from the server directory to see what a
+fresh worker spends on importing each component and initializing it.
+"""
+import asyncio
+import gc
+import importlib
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Imported in this order, so each entry is charged only for the modules it
+# adds on top of the ones before it
+COMPONENTS: List[Tuple[str, str]] = [
+    ("pydantic", "pydantic"),
+    ("starlette", "starlette.applications"),
+    ("fastapi", "fastapi"),
+    ("prometheus", "prometheus_client"),
+    ("motor", "motor.motor_asyncio"),
+    ("pymupdf", "fitz"),
+    ("spacy", "spacy"),
+    ("app", "app.main"),
+]
+
+
+class StartupReport:
+    """Seconds spent per component and phase ("import" or "init") at startup"""
+
+    def __init__(self):
+        self.entries: Dict[Tuple[str, str], float] = {}
+
+    @contextmanager
+    def timed(self, component: str, phase: str = "init"):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            key = (component, phase)
+            self.entries[key] = self.entries.get(key, 0.0) + time.perf_counter() - start_time
+
+    def import_module(self, component: str, module: str):
+        with self.timed(component, "import"):
+            return importlib.import_module(module)
+
+    @property
+    def total(self) -> float:
+        return sum(self.entries.values())
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        report: Dict[str, Dict[str, float]] = {}
+        for (component, phase), seconds in self.entries.items():
+            report.setdefault(component, {})[phase] = round(seconds, 4)
+        return report
+
+    def log(self, title: str = "Startup"):
+        logger.info(
+            f"{title} took {self.total:.2f}s: "
+            + ", ".join(f"{component} {phase}={seconds * 1000:.0f}ms"
+                        for (component, phase), seconds in self.entries.items()),
+            extra={"fields": {"startup": self.as_dict(), "total_seconds": round(self.total, 4)}}
+        )
+
+
+def preload(nlp_backend, report: StartupReport):
+    """Load what every worker needs before the master forks them.
+
+    Used with gunicorn's preload_app: the spaCy model and PyMuPDF are
+    loaded once and shared copy-on-write, and gc.freeze() moves the loaded
+    objects out of the collector's reach so collections in the workers do
+    not touch (and so copy) their pages.
+    """
+    report.import_module("pymupdf", "fitz")
+    with report.timed("spacy_model"):
+        nlp_backend.warm_up()
+    gc.collect()
+    gc.freeze()
+    report.log("Preload")
+
+
+def main():
+    report = StartupReport()
+    for component, module in COMPONENTS:
+        report.import_module(component, module)
+    server = sys.modules["app.main"]
+    with report.timed("spacy_model"):
+        server.nlp_backend.warm_up()
+    with report.timed("taxonomy"):
+        asyncio.run(server.taxonomy_store.reload())
+
+    print(f"{'component':<16}{'import ms':>12}{'init ms':>12}")
+    for component, phases in report.as_dict().items():
+        print(f"{component:<16}{phases.get('import', 0) * 1000:>12.1f}{phases.get('init', 0) * 1000:>12.1f}")
+    print(f"{'total':<16}{report.total * 1000:>24.1f}")
+
+
+if __name__ == "__main__":
+    main()
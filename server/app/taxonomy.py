@@ -0,0 +1,192 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from .metrics import taxonomy_index_size, taxonomy_reload_seconds, taxonomy_skills
+from .skill_matcher import SkillMatcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).parent / "data" / "skills.json"
+
+# Document in the state collection that announces taxonomy reloads
+RELOAD_STAMP_ID = "skill_taxonomy"
+
+
+# A skill as stored on a resume: its taxonomy id, or its name for skills
+# without one
+SkillKey = Union[int, str]
+
+
+class SkillTaxonomy:
+    """Skills, aliases and categories together with their compiled matcher.
+
+    Resumes store skills by their integer ``id``. Ids must stay with their
+    skill for good: renaming a skill keeps its id, and the id of a removed
+    skill is never given to another one.
+    """
+
+    def __init__(self, entries: List[dict]):
+        self.skills: List[str] = []
+        self.aliases: Dict[str, str] = {}
+        self.categories: Dict[str, str] = {}
+        self.ids: Dict[str, int] = {}
+        self.names: Dict[int, str] = {}
+        self._lookup: Dict[str, str] = {}
+        for entry in entries:
+            name = entry["name"]
+            self.skills.append(name)
+            self._lookup[name.lower()] = name
+            if entry.get("id") is not None:
+                skill_id = int(entry["id"])
+                if skill_id in self.names:
+                    raise ValueError(f"Skill id {skill_id} is used by both {self.names[skill_id]} and {name}")
+                self.ids[name] = skill_id
+                self.names[skill_id] = name
+            if entry.get("category"):
+                self.categories[name] = entry["category"]
+            for alias in entry.get("aliases", []):
+                self.aliases[alias] = name
+                self._lookup.setdefault(alias.lower(), name)
+        self.matcher = SkillMatcher(self.skills, self.aliases)
+        # Identifies the taxonomy contents, e.g. for keying cached results
+        self.version = hashlib.sha256(
+            json.dumps(entries, sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def canonical(self, term: str) -> Optional[str]:
+        """Resolve a skill name or alias, in any case, to its canonical name"""
+        return self._lookup.get(term.strip().lower())
+
+    def skill_key(self, skill: SkillKey) -> SkillKey:
+        """The stored form of a skill: its id, else its canonical name"""
+        if isinstance(skill, int):
+            return skill
+        name = self.canonical(skill) or skill
+        return self.ids.get(name, name)
+
+    def encode_skills(self, skills: Iterable[SkillKey]) -> List[SkillKey]:
+        return [self.skill_key(skill) for skill in skills]
+
+    def decode_skills(self, keys: Iterable[SkillKey]) -> List[str]:
+        """Skill names for stored keys; ids no longer in the taxonomy are left out"""
+        names = []
+        for key in keys:
+            if isinstance(key, int):
+                if key in self.names:
+                    names.append(self.names[key])
+            else:
+                names.append(key)
+        return names
+
+
+def load_taxonomy_file(path) -> SkillTaxonomy:
+    """Load a taxonomy from a JSON file of the form {"skills": [{"id", "name", "category", "aliases"}]}"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return SkillTaxonomy(data["skills"])
+
+
+class TaxonomyStore:
+    """Holds the active taxonomy and swaps it atomically on reload.
+
+    The taxonomy is read from SKILL_TAXONOMY_PATH (JSON) or, when
+    SKILL_TAXONOMY_SOURCE=mongo, from the given Mongo collection. Readers
+    grab ``store.current`` once per request; a reload builds the new index
+    off the event loop and replaces the reference in a single assignment,
+    so in-flight requests keep using the index they started with.
+
+    Each process holds its own copy. With a ``state_collection``, a reload
+    with ``publish`` writes a new stamp there, and ``watch`` reloads every
+    other process once it sees the stamp change, so all workers serve the
+    same taxonomy without a restart.
+    """
+
+    def __init__(self, path=None, collection=None, source: Optional[str] = None,
+                 state_collection=None):
+        self.source = (source or os.getenv("SKILL_TAXONOMY_SOURCE", "file")).lower()
+        self.path = Path(path or os.getenv("SKILL_TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH))
+        self.collection = collection
+        self.state_collection = state_collection
+        self._current: Optional[SkillTaxonomy] = None
+        self._mtime: Optional[float] = None
+        self._stamp: Optional[str] = None
+        self._reload_lock = asyncio.Lock()
+
+    @property
+    def current(self) -> SkillTaxonomy:
+        if self._current is None:
+            # Not loaded by the startup hook yet (e.g. scripts); read the file
+            self._swap(load_taxonomy_file(self.path), 0.0)
+        return self._current
+
+    def _swap(self, taxonomy: SkillTaxonomy, elapsed: float):
+        self._current = taxonomy
+        taxonomy_reload_seconds.set(elapsed)
+        taxonomy_skills.set(len(taxonomy))
+        taxonomy_index_size.set(taxonomy.matcher.pattern_count)
+
+    async def _load(self) -> SkillTaxonomy:
+        if self.source == "mongo":
+            if self.collection is None:
+                raise ValueError("SKILL_TAXONOMY_SOURCE=mongo requires a collection")
+            entries = await self.collection.find(
+                {}, {"_id": 0, "id": 1, "name": 1, "category": 1, "aliases": 1}
+            ).to_list(length=None)
+            return await asyncio.to_thread(SkillTaxonomy, entries)
+        self._mtime = self.path.stat().st_mtime
+        return await asyncio.to_thread(load_taxonomy_file, self.path)
+
+    async def _read_stamp(self) -> Optional[str]:
+        if self.state_collection is None:
+            return None
+        state = await self.state_collection.find_one({"_id": RELOAD_STAMP_ID}, {"stamp": 1})
+        return state.get("stamp") if state else None
+
+    async def reload(self, publish: bool = False) -> SkillTaxonomy:
+        """Rebuild the index from the configured source and swap it in.
+
+        With ``publish``, also tell the other processes to reload.
+        """
+        async with self._reload_lock:
+            # Read before loading, so a reload published meanwhile is not missed
+            stamp = await self._read_stamp()
+            start_time = time.perf_counter()
+            taxonomy = await self._load()
+            elapsed = time.perf_counter() - start_time
+            self._swap(taxonomy, elapsed)
+            if publish and self.state_collection is not None:
+                stamp = uuid.uuid4().hex
+                await self.state_collection.update_one(
+                    {"_id": RELOAD_STAMP_ID},
+                    {"$set": {"stamp": stamp, "version": taxonomy.version, "updated_at": datetime.utcnow()}},
+                    upsert=True
+                )
+            self._stamp = stamp
+            logger.info(
+                f"Skill taxonomy loaded from {self.source}: {len(taxonomy)} skills, "
+                f"{taxonomy.matcher.pattern_count} patterns in {elapsed:.3f}s"
+            )
+            return taxonomy
+
+    async def watch(self, interval: float):
+        """Reload when the taxonomy file changes on disk or a reload is published"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if self.source == "file" and self.path.stat().st_mtime != self._mtime:
+                    await self.reload()
+                elif await self._read_stamp() != self._stamp:
+                    await self.reload()
+            except Exception as e:
+                logger.error(f"Skill taxonomy reload failed: {str(e)}")
@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from typing import Optional, Union
+
+import filetype
+
+from .metrics import StageTimings, upload_buffer_bytes
+
+UPLOAD_CHUNK_SIZE = 256 * 1024
+# filetype only looks at the first 261 bytes
+SNIFF_BYTES = 1024
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload grows past the size limit while being read"""
+
+
+class UnsupportedUploadType(Exception):
+    """Raised when the sniffed file type is not the one expected"""
+
+
+class SpooledUpload:
+    """An uploaded file read once: hashed, sniffed and held for the parser.
+
+    Small files stay in a single in-memory buffer; once a file passes the
+    spool threshold it is moved to a temporary file and only the path is
+    handed on, so the parser (possibly in another process) reads it from
+    disk instead of receiving a copy of the bytes. Call ``close()`` when
+    done to release the buffer or delete the file.
+    """
+
+    def __init__(self, filename: Optional[str] = None):
+        self.filename = filename
+        self.size = 0
+        self.digest: Optional[str] = None
+        self.mime: Optional[str] = None
+        self.path: Optional[str] = None
+        self._buffer: Optional[bytearray] = bytearray()
+        self._file = None
+
+    @property
+    def source(self) -> Union[bytearray, str]:
+        """The PDF buffer, or the path of the temporary file holding it"""
+        return self.path if self.path is not None else self._buffer
+
+    async def write(self, chunk: bytes, spool_threshold: int, spool_dir: Optional[str] = None):
+        """Add the next chunk, moving to a temporary file past the threshold"""
+        self.size += len(chunk)
+        if self._file is not None:
+            await asyncio.to_thread(self._file.write, chunk)
+            return
+        self._buffer.extend(chunk)
+        upload_buffer_bytes.inc(len(chunk))
+        if self.size > spool_threshold:
+            self._file = tempfile.NamedTemporaryFile(
+                prefix="upload-", suffix=".pdf", dir=spool_dir, delete=False
+            )
+            self.path = self._file.name
+            await asyncio.to_thread(self._file.write, self._buffer)
+            self._release_buffer()
+
+    async def finish(self):
+        """Flush and close the temporary file so the parser can open it"""
+        if self._file is not None:
+            await asyncio.to_thread(self._file.close)
+            self._file = None
+
+    def _release_buffer(self):
+        if self._buffer is not None:
+            upload_buffer_bytes.dec(len(self._buffer))
+            self._buffer = None
+
+    def close(self):
+        self._release_buffer()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+
+async def read_upload(file, max_bytes: int, spool_threshold: int,
+                      spool_dir: Optional[str] = None,
+                      expected_mime: Optional[str] = None,
+                      timings: Optional[StageTimings] = None) -> SpooledUpload:
+    """Stream an UploadFile in chunks, hashing and sniffing in the same pass.
+
+    Raises UnsupportedUploadType after the first chunk if the sniffed type
+    is not ``expected_mime``, and UploadTooLarge as soon as more than
+    ``max_bytes`` have been read; nothing past the limit is kept.
+    """
+    timings = timings or StageTimings()
+    upload = SpooledUpload(file.filename)
+    sha256 = hashlib.sha256()
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            if upload.size == 0:
+                with timings.stage("sniff"):
+                    kind = filetype.guess(chunk[:SNIFF_BYTES])
+                upload.mime = kind.mime if kind else None
+                if expected_mime is not None and upload.mime != expected_mime:
+                    raise UnsupportedUploadType(f"Unsupported file type: {upload.mime}")
+            if upload.size + len(chunk) > max_bytes:
+                raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+            sha256.update(chunk)
+            await upload.write(chunk, spool_threshold, spool_dir)
+        await upload.finish()
+    except BaseException:
+        upload.close()
+        raise
+    upload.digest = sha256.hexdigest()
+    return upload
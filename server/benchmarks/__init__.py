@@ -0,0 +1,7 @@
+"""Performance benchmarks for the Resume Extractor backend.
+
+Run from the server directory, e.g. ``python -m benchmarks.skill_matching``.
+``benchmarks.end_to_end`` measures the whole upload pipeline on a
+synthetic corpus from ``benchmarks.corpus`` and can compare a run with a
+saved baseline.
+"""
@@ -0,0 +1,152 @@
+"""Generate synthetic resume PDFs with PyMuPDF.
+
+Documents vary in page count, how densely skills from the taxonomy are
+mentioned and whether pages carry embedded images, so the extraction
+stages can be measured on inputs resembling real uploads.
+
+Usage:
+    python -m benchmarks.corpus OUT_DIR [--count 50] [--pages 1-5]
+        [--skill-density 0.1] [--images 0.3] [--seed 42]
+"""
+import argparse
+import os
+import random
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import fitz  # PyMuPDF
+
+from app.taxonomy import DEFAULT_TAXONOMY_PATH, load_taxonomy_file
+
+FIRST_NAMES = ["Jane", "John", "Priya", "Wei", "Maria", "Ahmed", "Olga", "Kenji", "Amara", "Lucas"]
+LAST_NAMES = ["Doe", "Smith", "Sharma", "Chen", "Garcia", "Hassan", "Ivanova", "Tanaka", "Okafor", "Silva"]
+COMPANIES = ["Acme Corporation", "Globex Inc", "Initech", "Umbrella Labs", "Stark Industries",
+             "Wayne Enterprises", "Hooli", "Vandelay Industries", "Soylent Corp", "Cyberdyne Systems"]
+ROLES = ["Senior Software Engineer", "Software Developer", "Lead Engineer", "Data Analyst",
+         "Engineering Manager", "Principal Architect", "Junior Developer", "Consultant"]
+MONTHS = ["January", "March", "May", "July", "September", "November"]
+FILLER = ("designed built maintained services pipelines teams customers reliability latency "
+          "reviewed mentored shipped features migrated systems improved reduced costs across "
+          "platform product release quality testing automation monitoring").split()
+
+LINES_PER_PAGE = 45
+PAGE_RECT = fitz.paper_rect("letter")
+MARGIN = 54
+
+
+@dataclass
+class CorpusSpec:
+    count: int = 50
+    min_pages: int = 1
+    max_pages: int = 5
+    skill_density: float = 0.1  # share of filler words replaced by skills
+    image_ratio: float = 0.3  # share of pages with an embedded image
+    seed: int = 42
+
+
+def _person(rng: random.Random) -> Tuple[str, str, str]:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    email = f"{first.lower()}.{last.lower()}{rng.randint(1, 9999)}@example.com"
+    phone = f"+1 ({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}"
+    return f"{first} {last}", email, phone
+
+
+def _sentence(rng: random.Random, skills: List[str], density: float) -> str:
+    words = [rng.choice(skills) if rng.random() < density else rng.choice(FILLER)
+             for _ in range(rng.randint(8, 14))]
+    return " ".join(words).capitalize() + "."
+
+
+def _page_lines(rng: random.Random, number: int, spec: CorpusSpec, skills: List[str], person) -> List[str]:
+    lines = []
+    if number == 0:
+        name, email, phone = person
+        lines += [name, f"{email} | {phone}", "", "Experience"]
+    while len(lines) < LINES_PER_PAGE:
+        if rng.random() < 0.15:
+            start = rng.randint(2005, 2020)
+            lines.append(f"{rng.choice(ROLES)} at {rng.choice(COMPANIES)}, "
+                         f"{rng.choice(MONTHS)} {start} - {start + rng.randint(1, 4)}")
+        else:
+            lines.append(_sentence(rng, skills, spec.skill_density))
+    return lines
+
+
+def _image(rng: random.Random, width: int = 160, height: int = 120) -> fitz.Pixmap:
+    # Noise compresses poorly, like a photo or scanned logo would
+    return fitz.Pixmap(fitz.csRGB, width, height, rng.randbytes(width * height * 3), False)
+
+
+def _insert_text(page, rect: fitz.Rect, text: str, fontsize: float = 9, min_fontsize: float = 5):
+    # insert_textbox writes nothing and returns a negative number when the
+    # text overflows the box, e.g. the narrower box beside an image
+    while fontsize >= min_fontsize:
+        if page.insert_textbox(rect, text, fontsize=fontsize) >= 0:
+            return
+        fontsize -= 0.5
+    raise ValueError(f"Page text does not fit in {rect} at {min_fontsize}pt")
+
+
+def make_resume_pdf(rng: random.Random, pages: int, spec: CorpusSpec, skills: List[str]) -> bytes:
+    person = _person(rng)
+    with fitz.open() as document:
+        for number in range(pages):
+            page = document.new_page(width=PAGE_RECT.width, height=PAGE_RECT.height)
+            text_rect = fitz.Rect(MARGIN, MARGIN, PAGE_RECT.width - MARGIN, PAGE_RECT.height - MARGIN)
+            if rng.random() < spec.image_ratio:
+                image_rect = fitz.Rect(PAGE_RECT.width - MARGIN - 160, MARGIN, PAGE_RECT.width - MARGIN, MARGIN + 120)
+                page.insert_image(image_rect, pixmap=_image(rng))
+                text_rect.x1 = image_rect.x0 - 12
+            _insert_text(page, text_rect, "\n".join(_page_lines(rng, number, spec, skills, person)))
+        document.set_metadata({"producer": f"benchmark-corpus {rng.randint(1, 5)}"})
+        return document.tobytes(garbage=3, deflate=True)
+
+
+def generate_corpus(spec: CorpusSpec) -> List[Tuple[str, bytes]]:
+    """Return (filename, pdf bytes) pairs; the same spec gives the same corpus"""
+    rng = random.Random(spec.seed)
+    skills = load_taxonomy_file(DEFAULT_TAXONOMY_PATH).skills
+    return [
+        (f"resume-{index:04d}.pdf",
+         make_resume_pdf(rng, rng.randint(spec.min_pages, spec.max_pages), spec, skills))
+        for index in range(spec.count)
+    ]
+
+
+def parse_pages(value: str) -> Tuple[int, int]:
+    low, _, high = value.partition("-")
+    return int(low), int(high or low)
+
+
+def add_corpus_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--count", type=int, default=CorpusSpec.count)
+    parser.add_argument("--pages", type=parse_pages, default=(CorpusSpec.min_pages, CorpusSpec.max_pages),
+                        help="page count range, e.g. 1-5")
+    parser.add_argument("--skill-density", type=float, default=CorpusSpec.skill_density)
+    parser.add_argument("--images", type=float, default=CorpusSpec.image_ratio,
+                        help="share of pages with an embedded image")
+    parser.add_argument("--seed", type=int, default=CorpusSpec.seed)
+
+
+def spec_from_args(args) -> CorpusSpec:
+    return CorpusSpec(count=args.count, min_pages=args.pages[0], max_pages=args.pages[1],
+                      skill_density=args.skill_density, image_ratio=args.images, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out_dir")
+    add_corpus_arguments(parser)
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    total = 0
+    for filename, content in generate_corpus(spec_from_args(args)):
+        with open(os.path.join(args.out_dir, filename), "wb") as f:
+            f.write(content)
+        total += len(content)
+    print(f"Wrote {args.count} PDFs ({total / 1024 / 1024:.1f} MiB) to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
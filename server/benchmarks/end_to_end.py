@@ -0,0 +1,185 @@
+"""Benchmark the upload pipeline end to end on a synthetic corpus.
+
+Drives POST /upload and GET /resumes through httpx's ASGI transport, and
+the internal stages (extract_text_from_pdf, extract_resume_data,
+save_resume) directly. By default MongoDB is replaced with an in-memory
+stand-in (pip install mongomock-motor); ``--mongo real`` uses MONGODB_URI
+and MONGODB_DB instead and removes the resumes it inserted afterwards.
+The spaCy model must be installed.
+
+Results can be saved as a JSON baseline and later runs compared with it:
+
+    python -m benchmarks.end_to_end --save baseline.json
+    python -m benchmarks.end_to_end --compare baseline.json
+
+Usage:
+    python -m benchmarks.end_to_end [--count 40] [--pages 1-5] [--concurrency 4]
+        [--requests 200] [--mongo mock|real] [--save PATH] [--compare PATH]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, List
+
+# Settings for an isolated run, applied before the app is imported. Every
+# upload goes through the full pipeline: no rate limit, no result cache.
+os.environ.setdefault("RATE_LIMIT_BACKEND", "off")
+os.environ.setdefault("JOB_STORE", "memory")
+os.environ.setdefault("RESULT_CACHE_SIZE", "0")
+os.environ.setdefault("SKILL_INDEX_ENABLED", "false")
+os.environ.setdefault("LOG_DIR", os.path.join(tempfile.gettempdir(), "resume-benchmark-logs"))
+
+import httpx  # noqa: E402
+
+from app import main as server  # noqa: E402
+from benchmarks.corpus import add_corpus_arguments, generate_corpus, spec_from_args  # noqa: E402
+from benchmarks.report import compare_baseline, print_table, save_baseline, summarize  # noqa: E402
+
+
+async def measure(calls: List[Callable[[], Awaitable[None]]], concurrency: int) -> Dict[str, float]:
+    """Run the calls with ``concurrency`` in flight and summarize their latency"""
+    latencies: List[float] = []
+    errors = 0
+    queue = list(reversed(calls))
+
+    async def worker():
+        nonlocal errors
+        while queue:
+            call = queue.pop()
+            start = time.perf_counter()
+            try:
+                await call()
+            except Exception as e:
+                errors += 1
+                if errors <= 3:
+                    print(f"  error: {e}", file=sys.stderr)
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    stats = summarize(latencies, time.perf_counter() - start)
+    stats["errors"] = errors
+    return stats
+
+
+async def setup(mongo_mode: str):
+    if mongo_mode == "mock":
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            sys.exit("mongomock-motor is not installed: pip install mongomock-motor, or use --mongo real")
+        server.mongo.attach(AsyncMongoMockClient(), "resume_benchmark")
+    else:
+        await server.mongo.connect()
+    server.log_pipeline.start()
+    await server.taxonomy_store.reload()
+    server.pdf_engine.start()
+    await asyncio.to_thread(server.nlp_backend.warm_up)
+    await server.nlp_executor.start()
+
+
+async def teardown(mongo_mode: str, inserted: List):
+    if mongo_mode == "real" and inserted:
+        await server.mongo.db.resumes.delete_many({"_id": {"$in": inserted}})
+    server.nlp_executor.shutdown()
+    server.pdf_engine.shutdown()
+    server.mongo.close()
+    server.log_pipeline.stop()
+
+
+async def run(args) -> Dict[str, Dict[str, float]]:
+    spec = spec_from_args(args)
+    start = time.perf_counter()
+    corpus = generate_corpus(spec)
+    size = sum(len(content) for _, content in corpus)
+    print(f"Generated {len(corpus)} PDFs ({size / 1024 / 1024:.1f} MiB) "
+          f"in {time.perf_counter() - start:.1f}s")
+
+    await setup(args.mongo)
+    results: Dict[str, Dict[str, float]] = {}
+    inserted: List = []
+    try:
+        # Internal stages, one document at a time
+        pages_by_doc: List[List[str]] = []
+        data_by_doc: List[dict] = []
+
+        def extract_text(content: bytes):
+            async def call():
+                pages_by_doc.append(await server.extract_pages_from_pdf(content))
+            return call
+
+        def extract_data(pages: List[str]):
+            async def call():
+                data_by_doc.append(await server.extract_resume_data(pages))
+            return call
+
+        def save(data: dict):
+            async def call():
+                result = await server.save_resume(dict(data))
+                inserted.append(result.inserted_id)
+            return call
+
+        results["extract_text_from_pdf"] = await measure([extract_text(content) for _, content in corpus], 1)
+        results["extract_resume_data"] = await measure([extract_data(pages) for pages in pages_by_doc], 1)
+        results["save_resume"] = await measure([save(data) for data in data_by_doc], 1)
+
+        # HTTP endpoints
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="https://testserver", timeout=120) as client:
+            def upload(filename: str, content: bytes):
+                async def call():
+                    response = await client.post("/upload", files={"file": (filename, content, "application/pdf")})
+                    if response.status_code != 200:
+                        raise RuntimeError(f"POST /upload {response.status_code}: {response.text[:200]}")
+                    inserted.append(server.ObjectId(response.json()["id"]))
+                return call
+
+            def get(path: str):
+                async def call():
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        raise RuntimeError(f"GET {path} {response.status_code}")
+                return call
+
+            results["POST /upload"] = await measure(
+                [upload(filename, content) for filename, content in corpus], args.concurrency
+            )
+            results["GET /resumes"] = await measure(
+                [get("/resumes?limit=20") for _ in range(args.requests)], args.concurrency
+            )
+            results["GET /resumes (ndjson)"] = await measure(
+                [get("/resumes?format=ndjson") for _ in range(max(args.requests // 10, 1))], args.concurrency
+            )
+    finally:
+        await teardown(args.mongo, inserted)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_corpus_arguments(parser)
+    parser.set_defaults(count=40)
+    parser.add_argument("--concurrency", type=int, default=4, help="requests in flight for HTTP scenarios")
+    parser.add_argument("--requests", type=int, default=200, help="GET /resumes requests")
+    parser.add_argument("--mongo", choices=("mock", "real"), default="mock")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare the results with a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown before a scenario counts as regressed (default 0.10)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print_table(results)
+    settings = {key: value for key, value in vars(args).items() if key not in ("save", "compare")}
+    if args.save:
+        save_baseline(args.save, results, settings)
+    if args.compare and not compare_baseline(args.compare, results, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Measure the fixed per-request cost of each middleware layer.
+
+Requests go through httpx's ASGI transport straight into the app, so the
+numbers contain no network or server time. Each layer is timed on its
+own around a minimal app serving ``/health`` and ``/resumes/{id}``, then
+the default stack from main.py is timed as a whole.
+
+Usage:
+    python -m benchmarks.middleware_stack [--requests 2000] [--concurrency 16]
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from typing import Callable, Dict, List
+
+import httpx
+from starlette.applications import Starlette
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.middleware.httpsredirect import HTTPSRedirectMiddleware
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.middleware.trustedhost import TrustedHostMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.middleware import (AccessLogMiddleware, BodySizeLimitMiddleware, MetricsMiddleware,
+                            RateLimitMiddleware, SecurityHeadersMiddleware)
+from app.rate_limit import TokenBucketLimiter
+from benchmarks.report import percentile
+
+DEFAULT_STACK = "metrics,access_log,https_redirect,cors,security_headers,rate_limit,body_limit,gzip"
+
+RESUME = {
+    "_id": "65a1f0c2e4b0a1b2c3d4e5f6",
+    "name": "Jane Doe",
+    "email": "jane.doe@example.com",
+    "phone": "+1 555 010 7788",
+    "skills": ["Python", "FastAPI", "MongoDB", "Docker", "AWS", "React", "SQL", "Git"],
+    "experience": [
+        {"company": f"Company {index}", "role": "Senior Software Engineer",
+         "dates": ["2018", "2021"], "description": "Built and ran services. " * 8}
+        for index in range(4)
+    ],
+    "uploaded_at": "2024-01-12T10:00:00",
+    "tags": [],
+}
+
+
+async def health(request):
+    return JSONResponse({"status": "healthy"})
+
+
+async def get_resume(request):
+    return JSONResponse(RESUME)
+
+
+def endpoint_app() -> Starlette:
+    return Starlette(routes=[
+        Route("/health", health),
+        Route("/resumes/{resume_id}", get_resume),
+    ])
+
+
+def null_logger(name: str) -> logging.Logger:
+    """A logger that creates records but discards them, like a sampled-out access log"""
+    logger = logging.getLogger(name)
+    logger.addHandler(logging.NullHandler())
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+LAYERS: Dict[str, Callable] = {
+    "metrics": lambda app: MetricsMiddleware(app),
+    "access_log": lambda app: AccessLogMiddleware(app, access_logger=null_logger("bench.access")),
+    "https_redirect": lambda app: HTTPSRedirectMiddleware(app),
+    "trusted_host": lambda app: TrustedHostMiddleware(app, allowed_hosts=["testserver"]),
+    "cors": lambda app: CORSMiddleware(
+        app, allow_origins=["https://example.com"], allow_credentials=True,
+        allow_methods=["GET", "POST"], allow_headers=["Authorization", "Content-Type"],
+    ),
+    "security_headers": lambda app: SecurityHeadersMiddleware(app),
+    # Limit high enough never to reject, so every request pays for the check
+    "rate_limit": lambda app: RateLimitMiddleware(app, TokenBucketLimiter(10 ** 9, 1)),
+    "body_limit": lambda app: BodySizeLimitMiddleware(app, limits={"/upload": 10 * 1024 * 1024}),
+    "gzip": lambda app: GZipMiddleware(app, minimum_size=1000),
+    "session": lambda app: SessionMiddleware(app, secret_key="benchmark"),
+}
+
+
+def build(layers: List[str]):
+    app = endpoint_app()
+    for layer in reversed(layers):
+        app = LAYERS[layer](app)
+    return app
+
+
+async def run(app, path: str, requests: int, concurrency: int):
+    """Return per-request latencies (seconds) and overall requests/second"""
+    transport = httpx.ASGITransport(app=app)
+    # https so the redirect layer passes requests through
+    async with httpx.AsyncClient(transport=transport, base_url="https://testserver") as client:
+        headers = {"Origin": "https://example.com", "Accept-Encoding": "gzip"}
+        for _ in range(50):
+            await client.get(path, headers=headers)
+
+        latencies: List[float] = []
+        remaining = requests
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.status_code
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, requests / elapsed
+
+
+async def main_async(args):
+    stack = [layer.strip() for layer in args.stack.split(",") if layer.strip()]
+    cases = [("(none)", [])] + [(layer, [layer]) for layer in LAYERS] + [("full stack", stack)]
+    for path in ("/health", "/resumes/65a1f0c2e4b0a1b2c3d4e5f6"):
+        print(f"{path} ({args.requests} requests, concurrency {args.concurrency})")
+        print(f"  {'layer':<18}{'p50 us':>9}{'p99 us':>9}{'req/s':>9}{'+p50 us':>9}")
+        baseline = None
+        for label, layers in cases:
+            latencies, throughput = await run(build(layers), path, args.requests, args.concurrency)
+            p50 = statistics.median(latencies) * 1e6
+            if baseline is None:
+                baseline = p50
+            p99 = percentile(latencies, 0.99) * 1e6
+            print(f"  {label:<18}{p50:9.0f}{p99:9.0f}{throughput:9.0f}{p50 - baseline:+9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="concurrent clients; 1 gives the cleanest per-request latency")
+    parser.add_argument("--stack", default=DEFAULT_STACK,
+                        help="comma separated layers, outermost first (as in MIDDLEWARE)")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Latency summaries and JSON baselines shared by the benchmarks."""
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """Throughput and latency percentiles (milliseconds) of one scenario"""
+    if not latencies:
+        return {"count": 0}
+    return {
+        "count": len(latencies),
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def print_table(results: Dict[str, Dict[str, float]]):
+    print(f"{'scenario':<28}{'n':>6}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, stats in results.items():
+        if not stats.get("count"):
+            print(f"{name:<28}{0:>6}")
+            continue
+        print(f"{name:<28}{stats['count']:>6}{stats['throughput']:>10.1f}"
+              f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, float]], settings: dict):
+    baseline = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "settings": settings,
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+    print(f"Baseline saved to {path}")
+
+
+def compare_baseline(path: str, results: Dict[str, Dict[str, float]], threshold: float) -> bool:
+    """Print the change against a saved baseline; False if any scenario regressed.
+
+    A scenario regresses when its p50 or p95 grows, or its throughput
+    drops, by more than ``threshold`` (a fraction).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {path} (commit {baseline.get('commit') or 'unknown'}, "
+          f"regression threshold {threshold:.0%})")
+    ok = True
+    for name, stats in results.items():
+        before = baseline["results"].get(name)
+        if not before or not before.get("count") or not stats.get("count"):
+            print(f"  {name:<28} no baseline")
+            continue
+        changes = {
+            "p50": stats["p50_ms"] / before["p50_ms"] - 1,
+            "p95": stats["p95_ms"] / before["p95_ms"] - 1,
+            "ops/s": stats["throughput"] / before["throughput"] - 1,
+        }
+        regressed = (changes["p50"] > threshold or changes["p95"] > threshold
+                     or changes["ops/s"] < -threshold)
+        ok = ok and not regressed
+        print(f"  {name:<28}" + "".join(f"{key} {value:+7.1%}   " for key, value in changes.items())
+              + ("REGRESSION" if regressed else ""))
+    return ok
@@ -0,0 +1,95 @@
+"""Time building and querying the similar resumes index, and its recall.
+
+Synthetic resumes draw skills from the bundled taxonomy plus generated
+ones, with popular skills more likely, so most skill sets repeat. Recall
+is measured against an exact Jaccard scan on a sample of queries.
+
+Usage:
+    python -m benchmarks.similarity [--resumes 1000000] [--skills 200] [--queries 1000]
+"""
+import argparse
+import random
+import time
+from typing import List
+
+from bson import ObjectId
+
+from app.similarity import SimilarityIndex
+from app.taxonomy import DEFAULT_TAXONOMY_PATH, load_taxonomy_file
+
+from .report import percentile
+
+BASE_SKILLS = load_taxonomy_file(DEFAULT_TAXONOMY_PATH).skills
+
+
+def make_skills(count: int) -> List[str]:
+    skills = list(BASE_SKILLS)
+    skills += [f"Skill {index}" for index in range(count - len(skills))]
+    return skills
+
+
+def make_resume(skills: List[str], weights: List[float], rng: random.Random) -> List[str]:
+    return list(set(rng.choices(skills, weights, k=rng.randint(2, 8))))
+
+
+def exact_top(index_sets, query: frozenset, limit: int, exclude: str) -> List[float]:
+    scores = sorted(
+        (len(query & skills) / len(query | skills)
+         for resume_id, skills in index_sets.items() if resume_id != exclude),
+        reverse=True,
+    )
+    return scores[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=1000000)
+    parser.add_argument("--skills", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--num-hashes", type=int, default=64)
+    parser.add_argument("--band-size", type=int, default=4)
+    parser.add_argument("--max-candidates", type=int, default=500)
+    parser.add_argument("--recall-queries", type=int, default=20, help="queries checked with an exact scan")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    skills = make_skills(args.skills)
+    weights = [1 / (rank + 1) for rank in range(len(skills))]
+    resumes = [(str(ObjectId()), make_resume(skills, weights, rng)) for _ in range(args.resumes)]
+
+    index = SimilarityIndex(num_hashes=args.num_hashes, band_size=args.band_size,
+                            max_candidates=args.max_candidates)
+    start = time.perf_counter()
+    for resume_id, resume_skills in resumes:
+        index.add(resume_id, resume_skills)
+    build = time.perf_counter() - start
+
+    sample = rng.sample(resumes, min(args.queries, len(resumes)))
+    latencies = []
+    for resume_id, resume_skills in sample:
+        start = time.perf_counter()
+        index.query(resume_skills, args.limit, exclude=resume_id)
+        latencies.append(time.perf_counter() - start)
+
+    # Recall of the top scores: an id-level comparison is meaningless when many resumes tie
+    sets = {resume_id: frozenset(resume_skills) for resume_id, resume_skills in resumes}
+    hits = total = 0
+    for resume_id, resume_skills in sample[:args.recall_queries]:
+        expected = exact_top(sets, frozenset(resume_skills), args.limit, resume_id)
+        found = [score for _, score in index.query(resume_skills, args.limit, exclude=resume_id)]
+        for score in expected:
+            total += 1
+            if score in found:
+                found.remove(score)
+                hits += 1
+
+    print(f"resumes: {args.resumes}, skills: {len(skills)}, {index.describe()}")
+    print(f"build:        {build:9.2f} s ({build / args.resumes * 1e6:.1f} us/resume)")
+    print(f"query p50:    {percentile(latencies, 0.50) * 1000:9.3f} ms")
+    print(f"query p99:    {percentile(latencies, 0.99) * 1000:9.3f} ms")
+    print(f"recall@{args.limit}:   {hits / max(total, 1):9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Compare the compiled skill matcher with the original per-skill loops.
+
+Usage:
+    python -m benchmarks.skill_matching [--skills 5000] [--words 2000] [--runs 20]
+"""
+import argparse
+import random
+import string
+import time
+from typing import List
+
+from app.skill_matcher import SkillMatcher
+from app.taxonomy import DEFAULT_TAXONOMY_PATH, load_taxonomy_file
+
+BASE_TAXONOMY = load_taxonomy_file(DEFAULT_TAXONOMY_PATH)
+BASE_SKILLS = BASE_TAXONOMY.skills
+
+
+def legacy_match(text: str, skills: List[str]) -> List[str]:
+    """The substring loops previously used by extract_resume_data"""
+    found = set()
+    for skill in skills:
+        if skill.lower() in text.lower():
+            found.add(skill)
+    for skill in skills:
+        if skill not in found:
+            if any(skill.lower() in word.lower() for word in text.split()):
+                found.add(skill)
+    return list(found)
+
+
+def make_taxonomy(size: int, rng: random.Random) -> List[str]:
+    skills = list(BASE_SKILLS)
+    while len(skills) < size:
+        words = rng.randint(1, 3)
+        skills.append(" ".join(
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))).capitalize()
+            for _ in range(words)
+        ))
+    return skills
+
+
+def make_resume(words: int, skills: List[str], rng: random.Random) -> str:
+    filler = ["experience", "team", "built", "services", "with", "and", "the", "project"]
+    out = []
+    for _ in range(words):
+        out.append(rng.choice(skills) if rng.random() < 0.05 else rng.choice(filler))
+    return " ".join(out)
+
+
+def timed(fn, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - start) / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skills", type=int, default=5000)
+    parser.add_argument("--words", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    skills = make_taxonomy(args.skills, rng)
+    text = make_resume(args.words, skills, rng)
+
+    start = time.perf_counter()
+    matcher = SkillMatcher(skills, BASE_TAXONOMY.aliases)
+    build = time.perf_counter() - start
+
+    legacy = timed(lambda: legacy_match(text, skills), max(1, args.runs // 10))
+    compiled = timed(lambda: matcher.match(text), args.runs)
+
+    print(f"taxonomy: {len(skills)} skills, document: {args.words} words")
+    print(f"matcher build:  {build * 1000:9.2f} ms (once per taxonomy)")
+    print(f"legacy loops:   {legacy * 1000:9.2f} ms/doc")
+    print(f"skill matcher:  {compiled * 1000:9.2f} ms/doc")
+    print(f"speedup:        {legacy / compiled:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
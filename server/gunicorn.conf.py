@@ -0,0 +1,28 @@
+# Gunicorn settings for the API server:
+#     gunicorn -c gunicorn.conf.py app.main:app
+#
+# Environment variables:
+#     PORT              - port to bind (default 8000)
+#     WEB_CONCURRENCY   - worker processes (default 4)
+#     GUNICORN_PRELOAD  - "true" to import the app and load the spaCy model
+#                         once in the master; workers fork from it and share
+#                         the model pages copy-on-write instead of each
+#                         loading their own copy (default false)
+#     GUNICORN_TIMEOUT  - seconds before a silent worker is restarted
+#                         (default 120)
+import importlib
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "false").lower() == "true"
+
+
+def on_starting(server):
+    # With preload_app the app module is already imported at this point;
+    # load the rest of the shared state before any worker is forked
+    if server.cfg.preload_app:
+        module = importlib.import_module(server.app.app_uri.split(":")[0])
+        module.preload()
@@ -17,11 +17,11 @@ setup(
         "python-jose[cryptography]==3.3.0",
         "passlib[bcrypt]==1.7.4",
         "python-magic==0.4.27",
-        "nltk==3.8.1",
         "spacy==3.7.2",
-        "pandas==2.0.3"
+        "pandas==2.0.3",
+        "pyarrow==14.0.1"
     ],
-    python_requires=">=3.8",
+    python_requires=">=3.10",
     include_package_data=True,
     zip_safe=False
 )
@@ -15,15 +15,13 @@ setup(
         "pymongo==4.5.0",
         "python-jose[cryptography]==3.3.0",
         "passlib[bcrypt]==1.7.4",
-        "nltk==3.8.1",
         "spacy==3.7.2",
         "pandas==2.0.3",
-        "ratelimit==2.2.1",
+        "pyarrow==14.0.1",
         "httpx==0.25.1",
         "filetype>=1.2.0",
         "itsdangerous==2.1.2",
-        "prometheus-client==0.19.0",
-        "prometheus-fastapi-instrumentator==5.9.1"
+        "prometheus-client==0.19.0"
     ],
-    python_requires='>=3.8',
+    python_requires='>=3.10',
 )